@@ -0,0 +1,124 @@
+"""Admission control for the HTTP endpoints.
+
+Each route belongs to a cost class. A class admits a fixed number of requests
+at once; the next few wait in a bounded FIFO queue, and anything that finds the
+queue full or waits past the class deadline gets an immediate 503 with
+``Retry-After``. Full-table dumps and searches therefore can't take every
+pooled connection away from logins and club pages during a burst.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from fastapi.responses import JSONResponse
+
+from config import (
+    ADMISSION_EXPENSIVE_CONCURRENCY,
+    ADMISSION_EXPENSIVE_QUEUE,
+    ADMISSION_EXPENSIVE_TIMEOUT,
+    ADMISSION_RETRY_AFTER,
+    ADMISSION_STANDARD_CONCURRENCY,
+    ADMISSION_STANDARD_QUEUE,
+    ADMISSION_STANDARD_TIMEOUT,
+)
+from metrics import admission_in_flight, admission_queue_depth, admission_shed, admission_wait
+
+# Route template -> cost class; routes not listed are "standard"
+ROUTE_COST_CLASSES = {
+    "/players": "expensive",
+    "/all-players": "expensive",
+    "/player-contracts": "expensive",
+    "/player_route": "expensive",
+    "/goalkeeper_route": "expensive",
+    "/players/as-of/{fifa_version}": "expensive",
+    "/leaderboards/rebuild": "expensive",
+    "/suggest/rebuild": "expensive",
+    "/suggest": "cheap",
+    "/login": "cheap",
+    "/register": "cheap",
+    "/metrics": "cheap",
+    "/debug/slow-queries": "cheap",
+}
+
+
+class AdmissionLimiter:
+    def __init__(self, cost_class, concurrency, queue_size, timeout):
+        self.cost_class = cost_class
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters = deque()
+
+    def shed(self, reason):
+        admission_shed.inc(self.cost_class, reason)
+        return JSONResponse(
+            {"detail": f"Server busy ({self.cost_class} requests), retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+        )
+
+    async def acquire(self):
+        """None once admitted, otherwise the 503 response to send back."""
+        if self.active < self.concurrency and not self.waiters:
+            self.active += 1
+            admission_in_flight.inc(self.cost_class)
+            return None
+        if len(self.waiters) >= self.queue_size:
+            return self.shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        admission_queue_depth.inc(self.cost_class)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self.abandon(waiter)
+                return self.shed("timeout")
+        except asyncio.CancelledError:
+            # Client went away while queued; pass on a slot it was already given
+            if waiter.done():
+                self.release()
+            else:
+                self.abandon(waiter)
+            raise
+        admission_wait.observe(self.cost_class, value=time.perf_counter() - start)
+        return None
+
+    def abandon(self, waiter):
+        self.waiters.remove(waiter)
+        waiter.cancel()
+        admission_queue_depth.dec(self.cost_class)
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter instead of freeing it
+        if self.waiters:
+            self.waiters.popleft().set_result(None)
+            admission_queue_depth.dec(self.cost_class)
+        else:
+            self.active -= 1
+            admission_in_flight.dec(self.cost_class)
+
+
+LIMITERS = {
+    "expensive": AdmissionLimiter(
+        "expensive",
+        ADMISSION_EXPENSIVE_CONCURRENCY,
+        ADMISSION_EXPENSIVE_QUEUE,
+        ADMISSION_EXPENSIVE_TIMEOUT,
+    ),
+    "standard": AdmissionLimiter(
+        "standard",
+        ADMISSION_STANDARD_CONCURRENCY,
+        ADMISSION_STANDARD_QUEUE,
+        ADMISSION_STANDARD_TIMEOUT,
+    ),
+}
+
+
+def limiter_for(route):
+    """The limiter guarding ``route``, or None for cheap routes."""
+    return LIMITERS.get(ROUTE_COST_CLASSES.get(route, "standard"))
@@ -0,0 +1,363 @@
+"""Endpoint and loader benchmarks against a local MySQL instance.
+
+Usage:
+    python -m benchmarks.run --scales 10k,100k --concurrency 16 --requests 200
+
+For every scale a synthetic dataset is written, loaded into a dedicated
+benchmark database with utils/load_data.py (timed), and every API endpoint is
+driven by concurrent clients against a uvicorn server started on that
+database. Results are written as JSON so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_CONFIG
+from utils import load_data
+from utils.db_connect import get_connection
+from utils.generate_players import generate
+from utils.init_db import TABLES
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+BENCH_PASSWORD = "bench-password"
+
+
+def parse_scale(value):
+    value = value.strip().lower()
+    if value in SCALES:
+        return value, SCALES[value]
+    return value, int(value)
+
+
+def reset_database(name):
+    conn = get_connection(include_db=False)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+    cursor.execute(f"CREATE DATABASE `{name}`")
+    cursor.execute(f"USE `{name}`")
+    for stmt in TABLES:
+        if "CREATE DATABASE" in stmt:
+            continue
+        cursor.execute(stmt)
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def time_loader(csv_path, rows):
+    start = time.perf_counter()
+    load_data.main(csv_path)
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "rows_per_sec": round(rows / elapsed, 1)}
+
+
+def sample_ids(limit=1000):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT PlayerID FROM PlayerStats LIMIT %s", (limit,))
+    player_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT PlayerID FROM GoalkeeperStats LIMIT %s", (limit,))
+    player_ids += [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT ClubID FROM Clubs LIMIT %s", (limit,))
+    club_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT FifaVersion FROM PlayerRatingHistory")
+    fifa_versions = [row[0] for row in cursor.fetchall()] or [24]
+    cursor.close()
+    conn.close()
+    return player_ids, club_ids, fifa_versions
+
+
+def database_url():
+    return "mysql+pymysql://{user}:{password}@{host}/{database}".format(**DB_CONFIG)
+
+
+def start_server(port, workers):
+    env = dict(os.environ, DATABASE_URL=database_url(), DB_NAME=DB_CONFIG["database"])
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(cmd, cwd=root, env=env)
+
+
+def wait_for_server(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/all-nationalities", timeout=5):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def send(base_url, method, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(
+        base_url + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json"} if data else {},
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    return time.perf_counter() - start, status, len(payload)
+
+
+def build_endpoints(player_ids, club_ids, fifa_versions, batch_size):
+    rng = random.Random(42)
+    counter = iter(range(10**9))
+    lock = threading.Lock()
+
+    def player():
+        return rng.choice(player_ids)
+
+    def club():
+        return rng.choice(club_ids)
+
+    def unique():
+        with lock:
+            return next(counter)
+
+    def prefix():
+        return rng.choice("abcdefghijklmnoprstuvw") + rng.choice(["", "a", "e", "o"])
+
+    def leaderboard_path():
+        metric = rng.choice(["overall", "value", "pace", "reflexes"])
+        if rng.random() < 0.5:
+            return f"/leaderboards/{metric}?limit=50"
+        return f"/leaderboards/{metric}?scope=club&group={club()}&limit=50"
+
+    def search_body():
+        return {
+            "starts_with": rng.choice("abcdefghijklmnoprstuvw"),
+            "nationality": "any",
+            "club": "any",
+            "outfield_players": True,
+            "goal_keepers": True,
+        }
+
+    def contract_body():
+        year = rng.randint(2025, 2030)
+        return {
+            "player_id": player(),
+            "club_id": club(),
+            "date_of_join": "2024-07-01",
+            "date_of_end": f"{year}-06-30",
+            "release_clause": rng.randint(1, 100) * 1_000_000,
+        }
+
+    def transfer_body():
+        year = rng.randint(2026, 2031)
+        return {
+            "player_id": player(),
+            "new_club_id": club(),
+            "contract_start": "2025-07-01",
+            "contract_end": f"{year}-06-30",
+            "release_clause": rng.randint(1, 100) * 1_000_000,
+        }
+
+    # (name, method, path factory, body factory)
+    return [
+        ("players", "GET", lambda: "/players", None),
+        ("clubs", "GET", lambda: "/clubs", None),
+        ("all-players", "GET", lambda: "/all-players", None),
+        ("all-nationalities", "GET", lambda: "/all-nationalities", None),
+        ("all-clubs", "GET", lambda: "/all-clubs", None),
+        ("club", "GET", lambda: f"/clubs/{club()}", None),
+        ("club-full", "GET", lambda: f"/clubs/{club()}/full", None),
+        ("club-goalkeepers", "GET", lambda: f"/clubs/{club()}/goalkeepers", None),
+        ("club-contracts", "GET", lambda: f"/clubs/{club()}/contracts", None),
+        ("club-outfield-players", "GET", lambda: f"/clubs/{club()}/outfield-players", None),
+        ("player-contracts", "GET", lambda: "/player-contracts", None),
+        ("player", "GET", lambda: f"/player/{player()}", None),
+        ("player-history", "GET", lambda: f"/player/{player()}/history", None),
+        ("players-as-of", "GET",
+         lambda: f"/players/as-of/{rng.choice(fifa_versions)}?club_id={club()}", None),
+        ("contracts-expiring", "GET", lambda: f"/contracts/expiring?club_id={club()}", None),
+        ("contracts-expiry-calendar", "GET", lambda: "/contracts/expiry-calendar", None),
+        ("leaderboards", "GET", leaderboard_path, None),
+        ("suggest", "GET", lambda: f"/suggest?q={prefix()}", None),
+        ("suggest-filtered", "GET",
+         lambda: f"/suggest?q={prefix()}&type=player&club={club()}", None),
+        ("players-batch", "POST", lambda: "/players/batch",
+         lambda: {"ids": rng.sample(player_ids, min(batch_size, len(player_ids)))}),
+        ("clubs-batch", "POST", lambda: "/clubs/batch",
+         lambda: {"ids": rng.sample(club_ids, min(batch_size, len(club_ids)))}),
+        ("player-search", "POST", lambda: "/player_route", search_body),
+        ("goalkeeper-search", "POST", lambda: "/goalkeeper_route", search_body),
+        ("register", "POST", lambda: "/register",
+         lambda: {"username": f"bench-{unique()}", "password": BENCH_PASSWORD}),
+        ("login", "POST", lambda: "/login",
+         lambda: {"username": "bench-user", "password": BENCH_PASSWORD}),
+        ("contract-new", "POST", lambda: "/contracts/new", contract_body),
+        ("transfer-player", "POST", lambda: "/transfer-player", transfer_body),
+    ]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def drive_endpoint(base_url, endpoint, requests, concurrency, warmup):
+    name, method, path_factory, body_factory = endpoint
+
+    def one(_):
+        return send(base_url, method, path_factory(), body_factory() if body_factory else None)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(warmup)))
+        start = time.perf_counter()
+        samples = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "endpoint": name,
+        "method": method,
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "mean_response_bytes": round(sum(s[2] for s in samples) / requests, 1),
+        "errors": sum(1 for _, status, _ in samples if status >= 500),
+        "statuses": statuses,
+    }
+
+
+def run_scale(label, rows, args):
+    print(f"== scale {label} ({rows} players)")
+    csv_path = os.path.join(args.workdir, f"male_players_{label}_seed{args.seed}.csv")
+    if not os.path.exists(csv_path):
+        print(f"  writing {csv_path}")
+        generate(csv_path, rows, seed=args.seed)
+
+    result = {"scale": label, "rows": rows}
+    if not args.skip_load:
+        reset_database(DB_CONFIG["database"])
+        print("  loading")
+        result["loader"] = time_loader(csv_path, rows)
+        print(f"  loader: {result['loader']}")
+
+    player_ids, club_ids, fifa_versions = sample_ids()
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port, args.workers)
+    try:
+        wait_for_server(base_url)
+        send(base_url, "POST", "/register",
+             {"username": "bench-user", "password": BENCH_PASSWORD})
+
+        result["endpoints"] = []
+        for endpoint in build_endpoints(player_ids, club_ids, fifa_versions, args.batch_size):
+            if args.only and endpoint[0] not in args.only:
+                continue
+            stats = drive_endpoint(
+                base_url, endpoint, args.requests, args.concurrency, args.warmup
+            )
+            print(
+                f"  {stats['endpoint']:<24} p50={stats['p50_ms']:>9.2f}ms "
+                f"p95={stats['p95_ms']:>9.2f}ms p99={stats['p99_ms']:>9.2f}ms "
+                f"rps={stats['requests_per_sec']:>8.1f}"
+            )
+            result["endpoints"].append(stats)
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10k",
+                        help="comma separated: 10k, 100k, 1m or a row count")
+    parser.add_argument("--database", default=os.getenv("BENCH_DB_NAME", "playerdb_bench"),
+                        help="benchmark database (dropped and recreated)")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", type=lambda v: set(v.split(",")),
+                        help="comma separated endpoint names to run")
+    parser.add_argument("--skip-load", action="store_true",
+                        help="reuse the data already in the benchmark database")
+    parser.add_argument("--workdir", default=tempfile.gettempdir(),
+                        help="where the synthetic CSV files are kept")
+    parser.add_argument("--output", default=None, help="JSON results file")
+    args = parser.parse_args(argv)
+
+    if args.database == "playerdb":
+        parser.error("refusing to benchmark against the application database")
+    DB_CONFIG["database"] = args.database
+
+    started = datetime.now(timezone.utc)
+    results = {
+        "meta": {
+            "started_at": started.isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": args.database,
+            "args": {k: sorted(v) if isinstance(v, set) else v for k, v in vars(args).items()},
+        },
+        "scales": [],
+    }
+    for value in args.scales.split(","):
+        label, rows = parse_scale(value)
+        results["scales"].append(run_scale(label, rows, args))
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{started.strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
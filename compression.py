@@ -0,0 +1,118 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+gzip is always available; brotli and zstd are used when the ``brotli`` /
+``zstandard`` packages are installed and the client prefers them. Bodies under
+``COMPRESSION_MIN_SIZE`` go out as they are. For the reference endpoints the
+compressed bytes are kept in an LRU keyed by a digest of the uncompressed body,
+so an unchanged club or nationality list is compressed once, not per request.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from config import COMPRESSION_CACHE_BYTES, COMPRESSION_LEVEL
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Route templates whose compressed bodies are cached
+CACHED_ROUTES = {"/all-clubs", "/all-nationalities", "/clubs", "/players", "/all-players"}
+
+
+def gzip_compress(body):
+    return gzip.compress(body, compresslevel=COMPRESSION_LEVEL, mtime=0)
+
+
+def brotli_compress(body):
+    return brotli.compress(body, quality=min(COMPRESSION_LEVEL, 11))
+
+
+def zstd_compress(body):
+    return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(body)
+
+
+# Server preference order among the encodings the client accepts
+ENCODERS = OrderedDict()
+if brotli is not None:
+    ENCODERS["br"] = brotli_compress
+if zstandard is not None:
+    ENCODERS["zstd"] = zstd_compress
+ENCODERS["gzip"] = gzip_compress
+
+
+def choose_encoding(accept_encoding: str):
+    """Best encoding the client accepts (q > 0), or None for identity."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best = None
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best[0] if best else None
+
+
+def is_compressible(content_type: str):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressedCache:
+    def __init__(self, max_bytes=COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+compressed_cache = CompressedCache()
+
+
+def compress(body: bytes, encoding: str, cache: bool):
+    if not cache:
+        return ENCODERS[encoding](body)
+    key = (encoding, hashlib.sha1(body).digest())
+    data = compressed_cache.get(key)
+    if data is None:
+        data = ENCODERS[encoding](body)
+        compressed_cache.put(key, data)
+    return data
@@ -17,3 +17,49 @@ def get_connection(include_db=True):
     if not include_db:
         config.pop("database", None)
     return mysql.connector.connect(**config)
+
+# Upper bound on the number of IDs accepted by the batch lookup endpoints
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "100"))
+
+# Debug mode adds X-DB-Time / X-DB-Queries headers to every response
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
+# Queries through execute_raw_query slower than this are logged with their plan
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "500"))
+
+# Serve the read endpoints from an exported SQLite snapshot instead of MySQL
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH") or None
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "1.0"))
+
+# Read replica routing (replica URLs come from DATABASE_REPLICA_URLS)
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+# After a write, the same client reads from the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Admission control: concurrent requests, wait queue length and queue deadline
+# (seconds) per cost class; cheap routes are never queued
+ADMISSION_EXPENSIVE_CONCURRENCY = int(os.getenv("ADMISSION_EXPENSIVE_CONCURRENCY", "4"))
+ADMISSION_EXPENSIVE_QUEUE = int(os.getenv("ADMISSION_EXPENSIVE_QUEUE", "8"))
+ADMISSION_EXPENSIVE_TIMEOUT = float(os.getenv("ADMISSION_EXPENSIVE_TIMEOUT", "2"))
+ADMISSION_STANDARD_CONCURRENCY = int(os.getenv("ADMISSION_STANDARD_CONCURRENCY", "16"))
+ADMISSION_STANDARD_QUEUE = int(os.getenv("ADMISSION_STANDARD_QUEUE", "32"))
+ADMISSION_STANDARD_TIMEOUT = float(os.getenv("ADMISSION_STANDARD_TIMEOUT", "5"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Total compressed bytes kept for reference endpoints (LRU)
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# Memory-mapped player/club store built by utils/build_shared_store.py
+SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH") or None
+SHARED_STORE_CHECK_INTERVAL = float(os.getenv("SHARED_STORE_CHECK_INTERVAL", "1.0"))
+# Workers poll playerclubchanges this often so transfers reach every worker;
+# polls re-read this many IDs back to catch changes that committed late
+CLUB_CHANGE_POLL_INTERVAL = float(os.getenv("CLUB_CHANGE_POLL_INTERVAL", "1.0"))
+CLUB_CHANGE_LOOKBACK = int(os.getenv("CLUB_CHANGE_LOOKBACK", "100"))
+# Rebuild the in-process store once this many moves are layered on top of it
+CLUB_MOVES_REBUILD_AT = int(os.getenv("CLUB_MOVES_REBUILD_AT", "2000"))
@@ -0,0 +1,119 @@
+"""Top-N leaderboards by rating, value and attributes, read from the player store.
+
+Every (metric, scope) board is a table in the store generation (see
+shared_store.py): a Group column and a Row column of row numbers into the
+players table, sorted by group, then best value first, then PlayerID. One
+group's board is the contiguous range two bisects find, so reading the top k
+is a slice of int64s every worker shares. Transfers made since the generation
+was built come in as a MovesOverlay indexed by club and league: on a board
+those moves touch, players who left are skipped and players who joined are
+merged in by value; any other board is read as a slice at the offset.
+"""
+
+import heapq
+from array import array
+from itertools import islice
+
+OUTFIELD_METRICS = ("Pace", "Shooting", "Passing", "Dribbling", "Defending", "Physical")
+GOALKEEPER_METRICS = ("Reflexes", "Diving", "Handling", "Positioning", "Speed")
+METRICS = ("Overall", "Value") + OUTFIELD_METRICS + GOALKEEPER_METRICS
+
+# Scope -> what picks the group; transfers change the club and league ones
+SCOPES = {
+    "global": None,
+    "league": "LeagueName",
+    "club": "ClubID",
+    "nationality": "NationalityID",
+}
+
+
+def metric_name(metric: str):
+    for name in METRICS:
+        if name.lower() == metric.lower():
+            return name
+    return None
+
+
+def board_table(metric: str, scope: str):
+    return f"board_{metric.lower()}_{scope}"
+
+
+def index_tables(players, clubs):
+    """Board tables for a store generation, from the base tables' columns."""
+    league_of = dict(zip(clubs["ClubID"], clubs["LeagueName"]))
+    player_ids = players["PlayerID"]
+    groups = {
+        "global": [0] * len(player_ids),
+        "league": [league_of.get(club_id) for club_id in players["ClubID"]],
+        "club": players["ClubID"],
+        "nationality": players["NationalityID"],
+    }
+    tables = {}
+    for metric in METRICS:
+        values = players[metric]
+        ranked = sorted(
+            (row for row, value in enumerate(values) if value is not None),
+            key=lambda row: (-values[row], player_ids[row]),
+        )
+        for scope, group_of in groups.items():
+            # Stable sort: rows stay best first within each group
+            rows = sorted(
+                (row for row in ranked if group_of[row] is not None),
+                key=group_of.__getitem__,
+            )
+            tables[board_table(metric, scope)] = [
+                ("Group", "str" if scope == "league" else "int", [group_of[row] for row in rows]),
+                ("Row", "int", array("q", rows)),
+            ]
+    return tables
+
+
+def top(generation, moves, metric: str, scope: str, group=None,
+        limit: int = 10, offset: int = 0):
+    players = generation.tables["players"]
+    clubs = generation.tables["clubs"]
+    board = generation.tables[board_table(metric, scope)]
+    values = players.columns[metric]
+    player_ids = players.columns["PlayerID"].values
+
+    def league(club_id):
+        row = clubs.find("ClubID", club_id) if club_id is not None else None
+        return clubs.columns["LeagueName"][row] if row is not None else None
+
+    key = 0 if scope == "global" else group
+    low, high = board.span("Group", key)
+    board_rows = board.columns["Row"].values
+    index = moves.index(generation) if scope in ("club", "league") and moves else None
+    joined = index.joined[scope].get(key, ()) if index else ()
+    if joined or (index and key in index.left[scope]):
+        # Skip the players who left this group and merge in the ones who joined
+        ranked = (
+            (-values.values[row], player_ids[row], row)
+            for row in board_rows[low:high] if row not in index.rows
+        )
+        joined = sorted(
+            (-values.values[row], player_ids[row], row)
+            for row in joined if values[row] is not None
+        )
+        rows = [row for _, _, row in islice(
+            heapq.merge(ranked, joined), offset, offset + limit
+        )]
+    else:
+        # No moves touch this board: the page is a slice of it
+        rows = board_rows[min(low + offset, high):min(low + offset + limit, high)]
+
+    results = []
+    for rank, row in enumerate(rows, start=offset + 1):
+        player_id = player_ids[row]
+        club_id = moves.get(player_id, players.columns["ClubID"][row])
+        results.append({
+            "Rank": rank,
+            "PlayerID": player_id,
+            "Name": players.columns["Name"][row],
+            "Position": players.columns["Position"][row],
+            "ClubID": club_id,
+            "LeagueName": league(club_id),
+            "NationalityID": players.columns["NationalityID"][row],
+            metric: values[row],
+        })
+    return results
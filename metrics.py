@@ -0,0 +1,206 @@
+"""Request and SQL metrics exposed in the Prometheus text format.
+
+The HTTP middleware in main.py opens a ``RequestStats`` for every request and
+stores it in ``current_request_stats``; the engine event hooks installed by
+``instrument_engine`` add each statement's count and duration to it, so per
+request query counts (and N+1 patterns) show up next to route latency.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, key)} {format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value):
+        with self.lock:
+            self.values[label_values] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, *label_values, value):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += 1
+            series[2] += value
+
+    def render(self):
+        lines = self.header()
+        with self.lock:
+            items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self.series.items())
+        names = self.labels + ("le",)
+        for key, (counts, total, value_sum) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(names, key + (format_value(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{format_labels(names, key + ('+Inf',))} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {total}")
+            lines.append(
+                f"{self.name}_sum{format_labels(self.labels, key)} {format_value(value_sum)}"
+            )
+        return lines
+
+
+REGISTRY = []
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method", "route")
+)
+http_response_size = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL per request", ("method", "route")
+)
+admission_in_flight = Gauge(
+    "admission_in_flight", "Requests admitted and running per cost class", ("cost_class",)
+)
+admission_queue_depth = Gauge(
+    "admission_queue_depth", "Requests waiting for admission per cost class", ("cost_class",)
+)
+admission_wait = Histogram(
+    "admission_wait_seconds", "Time spent waiting for admission", ("cost_class",)
+)
+admission_shed = Counter(
+    "admission_shed_total", "Requests rejected with 503 by admission control",
+    ("cost_class", "reason"),
+)
+db_queries = Counter("db_queries_total", "SQL statements executed")
+db_query_duration = Histogram("db_query_duration_seconds", "SQL statement latency")
+
+
+class RequestStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.db_time = 0.0
+
+    def add_query(self, elapsed):
+        with self.lock:
+            self.queries += 1
+            self.db_time += elapsed
+
+
+current_request_stats = ContextVar("current_request_stats", default=None)
+
+
+def instrument_engine(engine):
+    """Count and time every statement executed on ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        db_queries.inc()
+        db_query_duration.observe(value=elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.add_query(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+def render_prometheus():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
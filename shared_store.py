@@ -0,0 +1,554 @@
+"""Memory-mapped, column-oriented player store and the indexes built over it.
+
+A generation holds the player, club and nationality tables plus the index
+tables the leaderboards and the typeahead read (``leaderboards.index_tables``,
+``typeahead.index_tables``): board row numbers, token arrays, ranks and top
+lists. Nothing is copied into per-worker dicts; readers bisect and slice the
+columns in place.
+
+With SHARED_STORE_PATH set, ``utils/build_shared_store.py`` (the supervisor
+side) or a rebuild request writes the generation to that file and every
+uvicorn worker maps it read-only, so the pages are shared through the OS page
+cache. Integer columns are packed ``int64`` arrays read straight out of the
+mapping; string columns are an offsets array plus one UTF-8 blob. A new
+generation is written next to the old file and swapped in with os.replace;
+workers notice the new inode and remap, while requests still holding the
+previous generation keep reading it until they let go. Without a shared path
+each worker keeps the same encoded generation in memory (LocalStore), built at
+startup and rebuilt in the background after a bulk reload. Transfers made in
+between reach every worker through the club change feed (ClubMoves).
+
+File layout: 8-byte magic, little-endian uint64 header length, JSON header
+(padded to 8 bytes), then the column data at the offsets the header lists.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from datetime import datetime
+
+import leaderboards
+import statements
+import typeahead
+from config import (
+    CLUB_CHANGE_LOOKBACK,
+    CLUB_CHANGE_POLL_INTERVAL,
+    CLUB_MOVES_REBUILD_AT,
+    SHARED_STORE_CHECK_INTERVAL,
+)
+
+MAGIC = b"PLSTORE2"
+HEADER_LENGTH = struct.Struct("<Q")
+NULL_INT = -(1 << 63)
+
+METRIC_COLUMNS = (
+    "Overall", "Value",
+    "Pace", "Shooting", "Passing", "Dribbling", "Defending", "Physical",
+    "Reflexes", "Diving", "Handling", "Positioning", "Speed",
+)
+
+# Base table -> ordered (column, type); query rows come back in this order
+TABLES = {
+    "players": (
+        [("PlayerID", "int"), ("Name", "str"), ("Position", "str"), ("ClubID", "int"),
+         ("NationalityID", "int")]
+        + [(column, "int") for column in METRIC_COLUMNS]
+    ),
+    "clubs": [("ClubID", "int"), ("ClubName", "str"), ("LeagueName", "str"),
+              ("NationalityID", "int")],
+    "nationality": [("NationalityID", "int"), ("NationalityName", "str")],
+}
+
+QUERIES = {
+    "players": statements.STORE_PLAYERS,
+    "clubs": statements.STORE_CLUBS,
+    "nationality": statements.STORE_NATIONALITY,
+}
+
+
+def generation_tables(execute, changes=True):
+    """Read the base tables with ``execute(statement) -> rows`` and index them.
+
+    Returns ``({table: [(column, type, values)]}, meta)`` for write_store or
+    encode_generation. Run it inside one transaction: the latest club change
+    is read first, so the generation includes every change up to it.
+    """
+    meta = {"change_id": 0}
+    if changes:
+        meta["change_id"] = list(execute(statements.LATEST_CLUB_CHANGE))[0][0]
+    columns = {}
+    for table, statement in QUERIES.items():
+        rows = list(execute(statement))
+        columns[table] = {
+            column: [row[index] for row in rows]
+            for index, (column, _) in enumerate(TABLES[table])
+        }
+    tables = {
+        table: [(column, kind, columns[table][column]) for column, kind in spec]
+        for table, spec in TABLES.items()
+    }
+    tables.update(leaderboards.index_tables(columns["players"], columns["clubs"]))
+    tables.update(typeahead.index_tables(columns["players"], columns["clubs"]))
+    return tables, meta
+
+
+def align(offset):
+    return (offset + 7) & ~7
+
+
+def encode_int_column(values):
+    if isinstance(values, array) and values.typecode == "q":
+        return values.tobytes()
+    return array("q", (NULL_INT if v is None else int(v) for v in values)).tobytes()
+
+
+def encode_str_column(values):
+    offsets = array("q", [0])
+    chunks = []
+    position = 0
+    for value in values:
+        encoded = b"" if value is None else str(value).encode("utf-8")
+        chunks.append(encoded)
+        position += len(encoded)
+        offsets.append(position)
+    return offsets.tobytes(), b"".join(chunks)
+
+
+def encode_generation(tables, meta=None):
+    """Encode ``{table: [(column, type, values)]}``; returns (generation, bytes)."""
+    header = {
+        "generation": time.time_ns(),
+        "built_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "byteorder": sys.byteorder,
+        "meta": meta or {},
+        "tables": {},
+    }
+    blobs = []
+    position = 0
+
+    def add_blob(data):
+        nonlocal position
+        offset = position
+        blobs.append((offset, data))
+        position = align(position + len(data))
+        return offset
+
+    for table, columns in tables.items():
+        spec = {"rows": len(columns[0][2]) if columns else 0, "columns": {}}
+        for column, kind, values in columns:
+            if len(values) != spec["rows"]:
+                raise ValueError(f"{table}.{column} has {len(values)} rows, not {spec['rows']}")
+            if kind == "int":
+                spec["columns"][column] = {
+                    "type": "int", "offset": add_blob(encode_int_column(values)),
+                }
+            else:
+                offsets, data = encode_str_column(values)
+                spec["columns"][column] = {
+                    "type": "str",
+                    "offsets": add_blob(offsets),
+                    "data": add_blob(data),
+                    "length": len(data),
+                }
+        header["tables"][table] = spec
+
+    encoded_header = json.dumps(header).encode("utf-8")
+    data_start = align(len(MAGIC) + HEADER_LENGTH.size + len(encoded_header))
+    encoded = bytearray(data_start + position)
+    encoded[:len(MAGIC)] = MAGIC
+    HEADER_LENGTH.pack_into(encoded, len(MAGIC), len(encoded_header))
+    header_start = len(MAGIC) + HEADER_LENGTH.size
+    encoded[header_start:header_start + len(encoded_header)] = encoded_header
+    for offset, data in blobs:
+        encoded[data_start + offset:data_start + offset + len(data)] = data
+    return header["generation"], encoded
+
+
+def write_store(path, tables, meta=None):
+    """Write a generation to ``path`` and swap it in; returns its generation."""
+    generation, encoded = encode_generation(tables, meta)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".store-", suffix=".bin", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return generation
+
+
+def check_bounds(buffer, end):
+    if end > len(buffer):
+        raise ValueError("player store is truncated")
+
+
+class IntColumn:
+    def __init__(self, buffer, spec, rows):
+        start = spec["offset"]
+        check_bounds(buffer, start + 8 * rows)
+        # Raw int64s, for bisecting and slicing; NULLs show up as NULL_INT here
+        self.values = buffer[start:start + 8 * rows].cast("q")
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        value = self.values[index]
+        return None if value == NULL_INT else value
+
+
+class StrColumn:
+    def __init__(self, buffer, spec, rows):
+        start = spec["offsets"]
+        check_bounds(buffer, max(start + 8 * (rows + 1), spec["data"] + spec["length"]))
+        self.offsets = buffer[start:start + 8 * (rows + 1)].cast("q")
+        self.data = buffer[spec["data"]:spec["data"] + spec["length"]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        value = self.data[self.offsets[index]:self.offsets[index + 1]]
+        return str(value, "utf-8") if len(value) else None
+
+
+class StoreTable:
+    def __init__(self, buffer, spec):
+        self.rows = spec["rows"]
+        self.columns = {}
+        for column, column_spec in spec["columns"].items():
+            kind = IntColumn if column_spec["type"] == "int" else StrColumn
+            self.columns[column] = kind(buffer, column_spec, self.rows)
+
+    def __len__(self):
+        return self.rows
+
+    def record(self, index):
+        return {column: values[index] for column, values in self.columns.items()}
+
+    def records(self):
+        for index in range(self.rows):
+            yield self.record(index)
+
+    def span(self, column, key, low=0, high=None):
+        """Rows ``[start, end)`` holding ``key`` in a column sorted ascending."""
+        values = self.columns[column]
+        if isinstance(values, IntColumn):
+            values = values.values
+        high = self.rows if high is None else high
+        start = bisect.bisect_left(values, key, low, high)
+        return start, bisect.bisect_right(values, key, start, high)
+
+    def find(self, column, key):
+        """Row of ``key`` in a unique, sorted column, or None."""
+        start, end = self.span(column, key)
+        return start if start < end else None
+
+
+class StoreGeneration:
+    def __init__(self, buffer, name="player store"):
+        buffer = memoryview(buffer)
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        if bytes(buffer[:len(MAGIC)]) != MAGIC or len(buffer) < header_start:
+            raise ValueError(f"{name} is not a player store generation")
+        (header_length,) = HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+        header = json.loads(bytes(buffer[header_start:header_start + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{name} was built on a {header['byteorder']}-endian machine")
+
+        data = buffer[align(header_start + header_length):]
+        self.generation = header["generation"]
+        self.built_at = header["built_at"]
+        self.meta = header["meta"]
+        self.tables = {
+            table: StoreTable(data, spec) for table, spec in header["tables"].items()
+        }
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        generation = cls(mapped, path)
+        # The mapping is released once nothing references its columns
+        generation.map = mapped
+        return generation
+
+
+class MovesIndex:
+    """Rows of one generation's players table that a MovesOverlay moves.
+
+    ``joined[scope][group]`` and ``left[scope][group]`` list the rows that
+    moved into and out of each club/league, so a board or a club filter only
+    looks at its own group's moves.
+    """
+
+    def __init__(self, generation, clubs):
+        players = generation.tables["players"]
+        club_table = generation.tables["clubs"]
+
+        def league(club_id):
+            row = club_table.find("ClubID", club_id) if club_id is not None else None
+            return club_table.columns["LeagueName"][row] if row is not None else None
+
+        # Row -> club moved to
+        self.rows = {}
+        self.joined = {"club": {}, "league": {}}
+        self.left = {"club": {}, "league": {}}
+        for player_id, club_id in clubs.items():
+            row = players.find("PlayerID", player_id)
+            if row is None:
+                continue
+            self.rows[row] = club_id
+            previous = players.columns["ClubID"][row]
+            self.add("club", row, club_id, previous)
+            self.add("league", row, league(club_id), league(previous))
+
+    def add(self, scope, row, joined, left):
+        self.joined[scope].setdefault(joined, []).append(row)
+        self.left[scope].setdefault(left, []).append(row)
+
+
+class MovesOverlay:
+    """``{player_id: club_id}`` moves to apply on top of a generation.
+
+    ClubMoves publishes a new overlay whenever the moves change and never
+    modifies a published one, so requests share it without locking or copying.
+    ``change_id`` is the generation change the moves were pruned against.
+    """
+
+    def __init__(self, clubs=None, change_id=0):
+        self.clubs = clubs if clubs is not None else {}
+        self.change_id = change_id
+        # (generation, MovesIndex) for the generation last read with this overlay
+        self.indexed = None
+
+    def __len__(self):
+        return len(self.clubs)
+
+    def get(self, player_id, default=None):
+        return self.clubs.get(player_id, default)
+
+    def items(self):
+        return self.clubs.items()
+
+    def index(self, generation):
+        """The moves by group for ``generation``'s rows, built once per generation."""
+        indexed = self.indexed
+        if indexed is None or indexed[0] is not generation:
+            indexed = (generation, MovesIndex(generation, self.clubs))
+            self.indexed = indexed
+        return indexed[1]
+
+
+class ClubMoves:
+    """Club moves the current generation doesn't include yet.
+
+    Generations are rebuilt in bulk, so moves are applied on top of them at
+    read time. Every write that moves a player also appends to the
+    playerclubchanges feed, and each worker polls it every ``poll_interval``
+    seconds from a background thread (start), so a transfer reaches every
+    worker rather than only the one that served it. IDs are handed out before
+    commit, so each poll re-reads ``lookback`` IDs to catch changes that
+    committed out of order; applying a change twice is harmless. A row without
+    a PlayerID marks a bulk reload.
+    """
+
+    def __init__(self, fetch=None, poll_interval=CLUB_CHANGE_POLL_INTERVAL,
+                 lookback=CLUB_CHANGE_LOOKBACK):
+        # fetch(after) -> [(change_id, player_id, club_id)]; None disables polling
+        self.fetch = fetch
+        self.poll_interval = poll_interval
+        self.lookback = lookback
+        self.lock = threading.Lock()
+        # player_id -> (change_id, club_id), only used under the lock
+        self.moves = {}
+        self.last_seen = 0
+        self.reloaded = 0
+        self.overlay = MovesOverlay()
+
+    def apply(self, change_id, player_id, club_id):
+        # Caller holds the lock; returns whether the moves changed
+        self.last_seen = max(self.last_seen, change_id)
+        if player_id is None:
+            self.reloaded = max(self.reloaded, change_id)
+        elif change_id > self.moves.get(player_id, (0, None))[0]:
+            self.moves[player_id] = (change_id, club_id)
+            return True
+        return False
+
+    def publish(self, change_id):
+        # Caller holds the lock
+        self.overlay = MovesOverlay(
+            {player_id: club_id for player_id, (_, club_id) in self.moves.items()}, change_id
+        )
+
+    def record(self, change_id, player_id, club_id):
+        with self.lock:
+            if self.apply(change_id, player_id, club_id):
+                self.publish(self.overlay.change_id)
+
+    def poll(self, generation):
+        included = generation.meta.get("change_id", 0)
+        after = max(self.last_seen, included) - self.lookback
+        changes = self.fetch(max(after, 0))
+        with self.lock:
+            changed = included != self.overlay.change_id
+            for change_id, player_id, club_id in changes:
+                changed = self.apply(change_id, player_id, club_id) or changed
+            # Keep a lookback of moves the generation may have missed as well
+            for player_id, (change_id, _) in list(self.moves.items()):
+                if change_id <= included - self.lookback:
+                    del self.moves[player_id]
+                    changed = True
+            if changed:
+                self.publish(included)
+            overlay = self.overlay
+        # Index it here rather than on the first request that reads it
+        overlay.index(generation)
+
+    def start(self, current):
+        """Poll the feed from a daemon thread against the ``current()`` generation."""
+        if self.fetch is None:
+            return
+
+        def run():
+            while True:
+                generation = current()
+                if generation is not None:
+                    try:
+                        self.poll(generation)
+                    except Exception:
+                        # The feed is unreachable: serve the moves we have and retry later
+                        pass
+                time.sleep(self.poll_interval)
+
+        threading.Thread(target=run, name="club-moves-poll", daemon=True).start()
+
+    def current(self):
+        """The latest MovesOverlay; never modified once published."""
+        return self.overlay
+
+    def stale(self, generation):
+        """Whether ``generation`` predates a reload or has too many moves on top."""
+        overlay = self.overlay
+        included = generation.meta.get("change_id", 0)
+        # Until the next poll prunes them, an overlay pruned against an older
+        # generation still counts moves this one includes
+        return self.reloaded > included or (
+            len(overlay) >= CLUB_MOVES_REBUILD_AT and overlay.change_id >= included
+        )
+
+
+class LocalStore:
+    """Generations built and kept by this process (no shared path configured)."""
+
+    def __init__(self, build):
+        # build() -> (tables, meta), e.g. generation_tables over a DB session
+        self.build = build
+        self.build_lock = threading.Lock()
+        self.generation = None
+
+    def current(self):
+        return self.generation
+
+    def publish(self, tables, meta):
+        _, encoded = encode_generation(tables, meta)
+        self.generation = StoreGeneration(encoded)
+
+    def rebuild(self):
+        # Readers keep using the previous generation until the new one is published
+        with self.build_lock:
+            self.publish(*self.build())
+        return self.current()
+
+    def rebuild_in_background(self):
+        """Start a rebuild unless one is already running."""
+        if not self.build_lock.acquire(False):
+            return
+
+        def run():
+            try:
+                self.publish(*self.build())
+            except Exception:
+                # Keep serving the current generation; the next trigger retries
+                pass
+            finally:
+                self.build_lock.release()
+
+        threading.Thread(target=run, name="player-store-build", daemon=True).start()
+
+    def ensure_built(self):
+        generation = self.current()
+        if generation is None:
+            with self.build_lock:
+                if self.current() is None:
+                    self.publish(*self.build())
+            generation = self.current()
+        return generation
+
+
+class SharedStore(LocalStore):
+    """Generations mapped from a file shared by every worker."""
+
+    def __init__(self, path, build=None, check_interval=SHARED_STORE_CHECK_INTERVAL):
+        super().__init__(build)
+        self.path = os.path.abspath(path)
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.identity = None
+        self.next_check = 0.0
+        try:
+            self.reload()
+        except FileNotFoundError:
+            # Not built yet: the first rebuild (or the supervisor) writes it
+            pass
+        except ValueError:
+            # Truncated or written by an older format: treat it as missing, so
+            # the first rebuild replaces it
+            pass
+
+    def file_identity(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def reload(self):
+        identity = self.file_identity()
+        self.generation = StoreGeneration.open(self.path)
+        self.identity = identity
+
+    def rebuild_in_background(self):
+        # utils/build_shared_store.py --interval owns periodic rebuilds, so
+        # workers don't each write a new file
+        pass
+
+    def publish(self, tables, meta):
+        write_store(self.path, tables, meta)
+        with self.lock:
+            self.reload()
+
+    def current(self):
+        now = time.monotonic()
+        if now >= self.next_check:
+            with self.lock:
+                if now >= self.next_check:
+                    self.next_check = now + self.check_interval
+                    try:
+                        if self.file_identity() != self.identity:
+                            self.reload()
+                    except (FileNotFoundError, ValueError):
+                        # Mid-swap, removed or unreadable: keep the generation
+                        # we have mapped
+                        pass
+        return self.generation
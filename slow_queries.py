@@ -0,0 +1,121 @@
+"""Slow-query log for statements run through ``execute_raw_query``.
+
+Statements slower than ``SLOW_QUERY_MS`` are recorded with their normalized
+text, redacted parameters, duration and row count. The first time a new
+statement shape turns up, ``EXPLAIN FORMAT=JSON`` is run for it on the same
+session and kept alongside the entry so the plan is available later.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from config import SLOW_QUERY_LOG_SIZE, SLOW_QUERY_MS
+
+logger = logging.getLogger("slow_queries")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,?)+\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str):
+    # Collapse formatting and literals so every call of a query has one shape
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    return _IN_LIST.sub("IN (...)", normalized)
+
+
+def fingerprint(normalized: str):
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def redact_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple, set)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_params(params: dict):
+    return {key: redact_value(value) for key, value in (params or {}).items()}
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, max_entries=SLOW_QUERY_LOG_SIZE):
+        self.threshold = threshold_ms / 1000
+        self.entries = deque(maxlen=max_entries)
+        self.plans = {}
+        self.lock = threading.Lock()
+
+    def observe(self, db, result, params: dict, duration: float, row_count: int,
+                name=None):
+        if duration < self.threshold:
+            return
+
+        # The statement as sent to the driver (expanding IN lists already rendered)
+        context = result.context
+        normalized = normalize_statement(context.statement)
+        key = fingerprint(normalized)
+
+        with self.lock:
+            first_seen = key not in self.plans
+            if first_seen:
+                self.plans[key] = None
+
+        if first_seen:
+            plan = self.explain(db, context)
+            with self.lock:
+                self.plans[key] = plan
+
+        entry = {
+            "fingerprint": key,
+            "name": name,
+            "statement": normalized,
+            "params": redact_params(params),
+            "duration_ms": round(duration * 1000, 3),
+            "rows": row_count,
+            "at": time.time(),
+        }
+        with self.lock:
+            self.entries.append(entry)
+        logger.warning(
+            "slow query %s (%s) %.1fms rows=%d: %s",
+            key, name or "raw", duration * 1000, row_count, normalized,
+        )
+
+    def explain(self, db, context):
+        if db.get_bind().dialect.name != "mysql":
+            return None
+        if not context.statement.lstrip().upper().startswith("SELECT"):
+            return None
+        parameters = context.parameters[0] if context.parameters else {}
+        try:
+            row = db.connection().exec_driver_sql(
+                "EXPLAIN FORMAT=JSON " + context.statement, parameters
+            ).first()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            return {"error": str(e)}
+
+    def snapshot(self):
+        with self.lock:
+            entries = list(self.entries)
+            plans = dict(self.plans)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "entries": entries,
+            "plans": plans,
+        }
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,69 @@
+"""Read-only serving from an exported SQLite snapshot.
+
+When SNAPSHOT_PATH is set the read endpoints get their sessions from here
+instead of MySQL. The file is watched for replacement (utils/export_snapshot.py
+swaps it in with os.replace); new sessions then open the new file while
+sessions already in flight finish on the old one.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import SNAPSHOT_CHECK_INTERVAL
+
+
+class SnapshotStore:
+    def __init__(self, path, check_interval=SNAPSHOT_CHECK_INTERVAL, on_engine=None):
+        self.path = os.path.abspath(path)
+        self.check_interval = check_interval
+        self.on_engine = on_engine
+        self.lock = threading.Lock()
+        self.identity = None
+        self.engine = None
+        self.session_factory = None
+        self.next_check = 0.0
+        self.reload()
+
+    def file_identity(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def reload(self):
+        identity = self.file_identity()
+        engine = create_engine(
+            f"sqlite:///file:{self.path}?mode=ro&uri=true",
+            connect_args={"check_same_thread": False},
+        )
+        if self.on_engine is not None:
+            self.on_engine(engine)
+        old_engine = self.engine
+        self.engine = engine
+        self.session_factory = sessionmaker(bind=engine)
+        self.identity = identity
+        if old_engine is not None:
+            # Only idle connections are closed; checked-out ones finish first
+            old_engine.dispose()
+
+    def refresh_if_replaced(self):
+        now = time.monotonic()
+        if now < self.next_check:
+            return
+        with self.lock:
+            if now < self.next_check:
+                return
+            self.next_check = now + self.check_interval
+            try:
+                replaced = self.file_identity() != self.identity
+            except FileNotFoundError:
+                # Mid-swap or removed: keep serving the snapshot we have open
+                return
+            if replaced:
+                self.reload()
+
+    def session(self):
+        self.refresh_if_replaced()
+        return self.session_factory()
@@ -0,0 +1,528 @@
+"""Named SQL statements used by the API endpoints.
+
+Every statement is wrapped in ``text()`` once, at import time, so requests
+don't build a new TextClause (and re-parse its bind parameters) on each call.
+SQLAlchemy caches the compiled form by SQL string either way. The names label
+the statements in the slow-query log.
+"""
+
+from sqlalchemy import bindparam, text
+
+# id(statement) -> registered name
+NAMES = {}
+
+
+def register(name, sql, *bind_params):
+    statement = text(sql)
+    if bind_params:
+        statement = statement.bindparams(*bind_params)
+    NAMES[id(statement)] = name
+    return statement
+
+
+def name_of(statement):
+    return NAMES.get(id(statement))
+
+
+ALL_PLAYERS = register("all_players", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.DOB,
+    p.Overall,
+    p.Value,
+    p.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    n.NationalityID,
+    n.NationalityName,
+    c.ClubID as "Club.ClubID",
+    c.ClubName as "Club.ClubName",
+    c.LeagueName as "Club.LeagueName",
+    n.NationalityID as "Nationality.NationalityID",
+    n.NationalityName as "Nationality.NationalityName",
+    CASE 
+        WHEN g.PlayerID IS NOT NULL THEN 'Goalkeeper'
+        ELSE 'Outfield'
+    END as Position
+FROM playerstats p 
+LEFT JOIN clubs c ON p.ClubID = c.ClubID 
+LEFT JOIN nationality n ON p.NationalityID = n.NationalityID
+LEFT JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LIMIT 100
+""")
+
+ALL_NATIONALITIES = register("all_nationalities", """
+SELECT 
+    NationalityID,
+    NationalityName
+FROM nationality
+ORDER BY NationalityName
+""")
+
+ALL_CLUBS = register("all_clubs", """
+SELECT 
+    c.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    c.NationalityID,
+    n.NationalityName
+FROM clubs c 
+LEFT JOIN nationality n ON c.NationalityID = n.NationalityID
+ORDER BY c.ClubName
+""")
+
+CLUB_DETAILS = register("club_details", """
+SELECT 
+    c.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    n.NationalityID,
+    n.NationalityName,
+    (
+        SELECT COUNT(*)
+        FROM playerstats p
+        WHERE p.ClubID = c.ClubID
+    ) as SquadSize
+FROM clubs c
+LEFT JOIN nationality n ON c.NationalityID = n.NationalityID
+WHERE c.ClubID = :club_id
+""")
+
+CLUB_PLAYERS = register("club_players", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.Overall,
+    p.Value,
+    CASE 
+        WHEN g.PlayerID IS NOT NULL THEN 'Goalkeeper'
+        ELSE 'Outfield'
+    END as Position,
+    g.Reflexes,
+    g.Diving,
+    g.Handling,
+    g.Positioning,
+    g.Speed,
+    os.Pace,
+    os.Shooting,
+    os.Passing,
+    os.Dribbling,
+    os.Defending,
+    os.Physical
+FROM playerstats p
+LEFT JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LEFT JOIN outfieldstats os ON p.PlayerID = os.PlayerID
+WHERE p.ClubID = :club_id
+""")
+
+CLUB_GOALKEEPERS = register("club_goalkeepers", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.Overall,
+    p.Value,
+    g.Reflexes,
+    g.Diving,
+    g.Handling,
+    g.Positioning,
+    g.Speed
+FROM playerstats p
+JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+WHERE p.ClubID = :club_id
+""")
+
+CLUB_CONTRACTS = register("club_contracts", """
+SELECT 
+    c.PlayerID,
+    p.Name as PlayerName,
+    c.DateOfJoin,
+    c.DateOfEnd,
+    c.ReleaseClause
+FROM contracts c
+JOIN playerstats p ON c.PlayerID = p.PlayerID
+WHERE c.ClubID = :club_id
+""")
+
+CLUB_OUTFIELD_PLAYERS = register("club_outfield_players", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.Overall,
+    p.Value,
+    os.Pace,
+    os.Shooting,
+    os.Passing,
+    os.Dribbling,
+    os.Defending,
+    os.Physical
+FROM playerstats p
+JOIN outfieldstats os ON p.PlayerID = os.PlayerID
+WHERE p.ClubID = :club_id
+""")
+
+CLUB_HEADER = register("club_header", """
+SELECT 
+    c.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    n.NationalityID,
+    n.NationalityName
+FROM clubs c
+LEFT JOIN nationality n ON c.NationalityID = n.NationalityID
+WHERE c.ClubID = :club_id
+""")
+
+# One pass over the squad carries both goalkeeper and outfield stats
+CLUB_SQUAD = register("club_squad", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.Overall,
+    p.Value,
+    g.PlayerID as GoalkeeperID,
+    g.Reflexes,
+    g.Diving,
+    g.Handling,
+    g.Positioning,
+    g.Speed,
+    os.PlayerID as OutfieldID,
+    os.Pace,
+    os.Shooting,
+    os.Passing,
+    os.Dribbling,
+    os.Defending,
+    os.Physical
+FROM playerstats p
+LEFT JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LEFT JOIN outfieldstats os ON p.PlayerID = os.PlayerID
+WHERE p.ClubID = :club_id
+""")
+
+PLAYER_DETAILS_SELECT = """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.DOB,
+    p.Overall,
+    p.Value,
+    p.ClubID,
+    p.NationalityID,
+    c.ClubName,
+    c.LeagueName,
+    n.NationalityName,
+    CASE 
+        WHEN g.PlayerID IS NOT NULL THEN 'Goalkeeper'
+        ELSE 'Outfield'
+    END as Position,
+    COALESCE(g.Reflexes, os.Pace) as Pace,
+    COALESCE(g.Diving, os.Shooting) as Shooting,
+    COALESCE(g.Handling, os.Passing) as Passing,
+    COALESCE(g.Positioning, os.Dribbling) as Dribbling,
+    COALESCE(g.Speed, os.Defending) as Defending,
+    COALESCE(NULL, os.Physical) as Physical,
+    g.Reflexes,
+    g.Diving,
+    g.Handling,
+    g.Positioning,
+    g.Speed
+FROM playerstats p 
+LEFT JOIN clubs c ON p.ClubID = c.ClubID 
+LEFT JOIN nationality n ON p.NationalityID = n.NationalityID 
+LEFT JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LEFT JOIN playerstats os ON p.PlayerID = os.PlayerID
+"""
+
+PLAYER_DETAILS = register(
+    "player_details", PLAYER_DETAILS_SELECT + "WHERE p.PlayerID = :player_id"
+)
+
+PLAYERS_BATCH = register(
+    "players_batch",
+    PLAYER_DETAILS_SELECT + "WHERE p.PlayerID IN :player_ids",
+    bindparam("player_ids", expanding=True),
+)
+
+# Squad sizes come from one grouped scan instead of a subquery per club
+CLUBS_BATCH = register("clubs_batch", """
+SELECT 
+    c.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    n.NationalityID,
+    n.NationalityName,
+    COALESCE(s.SquadSize, 0) as SquadSize
+FROM clubs c
+LEFT JOIN nationality n ON c.NationalityID = n.NationalityID
+LEFT JOIN (
+    SELECT ClubID, COUNT(*) as SquadSize
+    FROM playerstats
+    WHERE ClubID IN :club_ids
+    GROUP BY ClubID
+) s ON s.ClubID = c.ClubID
+WHERE c.ClubID IN :club_ids
+""", bindparam("club_ids", expanding=True))
+
+PLAYER_CONTRACTS = register("player_contracts", """
+SELECT c.*, p.Name as PlayerName, cl.ClubName 
+FROM contracts c 
+JOIN playerstats p ON c.PlayerID = p.PlayerID 
+JOIN clubs cl ON c.ClubID = cl.ClubID
+LIMIT 100
+""")
+
+INSERT_CONTRACT = register("insert_contract", """
+INSERT INTO contracts (PlayerID, ClubID, DateOfJoin, DateOfEnd, ReleaseClause)
+VALUES (:player_id, :club_id, :date_of_join, :date_of_end, :release_clause)
+""")
+
+UPDATE_PLAYER_CLUB = register("update_player_club", """
+UPDATE playerstats 
+SET ClubID = :club_id 
+WHERE PlayerID = :player_id
+""")
+
+END_CURRENT_CONTRACTS = register("end_current_contracts", """
+UPDATE contracts 
+SET DateOfEnd = CURRENT_DATE 
+WHERE PlayerID = :player_id AND DateOfEnd > CURRENT_DATE
+""")
+
+INSERT_TRANSFER_CONTRACT = register("insert_transfer_contract", """
+INSERT INTO contracts (PlayerID, ClubID, DateOfJoin, DateOfEnd, ReleaseClause)
+VALUES (:player_id, :club_id, :date_join, :date_end, :release_clause)
+""")
+
+SEARCH_OUTFIELD_PLAYERS = register("search_outfield_players", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.DOB,
+    p.Overall,
+    p.Value,
+    c.ClubID as "Club.ClubID",
+    c.ClubName as "Club.ClubName",
+    c.LeagueName as "Club.LeagueName",
+    n.NationalityID as "Nationality.NationalityID",
+    n.NationalityName as "Nationality.NationalityName",
+    'Outfield' as Position
+FROM playerstats p
+LEFT JOIN outfieldstats os ON p.PlayerID = os.PlayerID
+LEFT JOIN clubs c ON p.ClubID = c.ClubID
+LEFT JOIN nationality n ON p.NationalityID = n.NationalityID
+WHERE p.Name LIKE :name_pattern
+AND (:nationality_id IS NULL OR n.NationalityID = :nationality_id)
+AND (:club_id IS NULL OR c.ClubID = :club_id)
+LIMIT 50
+""")
+
+SEARCH_GOALKEEPERS_IN_PLAYERS = register("search_goalkeepers_in_players", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.DOB,
+    p.Overall,
+    p.Value,
+    c.ClubID as "Club.ClubID",
+    c.ClubName as "Club.ClubName",
+    c.LeagueName as "Club.LeagueName",
+    n.NationalityID as "Nationality.NationalityID",
+    n.NationalityName as "Nationality.NationalityName",
+    'Goalkeeper' as Position
+FROM playerstats p
+LEFT JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LEFT JOIN clubs c ON p.ClubID = c.ClubID
+LEFT JOIN nationality n ON p.NationalityID = n.NationalityID
+WHERE p.Name LIKE :name_pattern
+AND (:nationality_id IS NULL OR n.NationalityID = :nationality_id)
+AND (:club_id IS NULL OR c.ClubID = :club_id)
+LIMIT 50
+""")
+
+SEARCH_GOALKEEPERS = register("search_goalkeepers", """
+SELECT 
+    p.PlayerID,
+    p.Name,
+    p.DOB,
+    p.Overall,
+    p.Value,
+    c.ClubID as "Club.ClubID",
+    c.ClubName as "Club.ClubName",
+    c.LeagueName as "Club.LeagueName",
+    n.NationalityID as "Nationality.NationalityID",
+    n.NationalityName as "Nationality.NationalityName",
+    'Goalkeeper' as Position,
+    g.Reflexes,
+    g.Diving,
+    g.Handling,
+    g.Positioning,
+    g.Speed
+FROM playerstats p
+JOIN goalkeeperstats g ON p.PlayerID = g.PlayerID
+LEFT JOIN clubs c ON p.ClubID = c.ClubID
+LEFT JOIN nationality n ON p.NationalityID = n.NationalityID
+WHERE p.Name LIKE :name_pattern
+AND (:nationality_id = 'any' OR :nationality_id = '0' OR n.NationalityID = :nationality_id)
+AND (:club_id = 'any' OR :club_id = '0' OR c.ClubID = :club_id)
+LIMIT 50
+""")
+
+PLAYER_HISTORY = register("player_history", """
+SELECT 
+    h.FifaVersion,
+    h.FifaUpdate,
+    h.Overall,
+    h.Value,
+    h.ClubID,
+    c.ClubName
+FROM playerratinghistory h
+LEFT JOIN clubs c ON h.ClubID = c.ClubID
+WHERE h.PlayerID = :player_id
+ORDER BY h.FifaVersion, h.FifaUpdate
+""")
+
+# History rows are ordered by one integer key, FifaVersion * HISTORY_UPDATE_SCALE
+# + FifaUpdate. Each row's ValidUntil is the key of the player's next row (or
+# HISTORY_OPEN_ENDED), maintained by the loader, so "as of" is a range test.
+HISTORY_UPDATE_SCALE = 1000
+HISTORY_OPEN_ENDED = 2147483647
+
+# The row valid at :as_of for every player. The FifaVersion bound lets MySQL
+# prune partitions of later versions and ValidUntil is a range on
+# ix_history_valid_until (or ix_history_club_valid_until with a club); only
+# the requested page is joined to names.
+PLAYERS_AS_OF = register("players_as_of", f"""
+SELECT 
+    h.PlayerID,
+    COALESCE(p.Name, g.Name) as Name,
+    h.FifaVersion,
+    h.FifaUpdate,
+    h.Overall,
+    h.Value,
+    h.ClubID,
+    c.ClubName
+FROM (
+    SELECT PlayerID, FifaVersion, FifaUpdate, Overall, Value, ClubID
+    FROM playerratinghistory
+    WHERE FifaVersion <= :fifa_version
+    AND ValidUntil > :as_of
+    AND FifaVersion * {HISTORY_UPDATE_SCALE} + FifaUpdate <= :as_of
+    AND (:club_id IS NULL OR ClubID = :club_id)
+    ORDER BY Overall DESC, PlayerID
+    LIMIT :limit OFFSET :offset
+) h
+LEFT JOIN playerstats p ON h.PlayerID = p.PlayerID
+LEFT JOIN goalkeeperstats g ON h.PlayerID = g.PlayerID
+LEFT JOIN clubs c ON h.ClubID = c.ClubID
+ORDER BY h.Overall DESC, h.PlayerID
+""")
+
+# Contracts a transfer is about to cut short, with their current expiry month
+CURRENT_CONTRACTS_FOR_UPDATE = register("current_contracts_for_update", """
+SELECT ClubID, DateOfEnd, ReleaseClause
+FROM contracts
+WHERE PlayerID = :player_id AND DateOfEnd > CURRENT_DATE
+FOR UPDATE
+""")
+
+ADJUST_EXPIRY_BUCKET = register("adjust_expiry_bucket", """
+INSERT INTO contractexpirybuckets (ClubID, ExpiryMonth, Contracts, TotalReleaseClause)
+VALUES (:club_id, :expiry_month, :contracts, :release_clause)
+ON DUPLICATE KEY UPDATE
+    Contracts = Contracts + VALUES(Contracts),
+    TotalReleaseClause = TotalReleaseClause + VALUES(TotalReleaseClause)
+""")
+
+# Range scan on the DateOfEnd index, most expensive release clauses first
+EXPIRING_CONTRACTS = register("expiring_contracts", """
+SELECT 
+    ct.PlayerID,
+    COALESCE(p.Name, g.Name) as PlayerName,
+    ct.ClubID,
+    c.ClubName,
+    c.LeagueName,
+    ct.DateOfJoin,
+    ct.DateOfEnd,
+    ct.ReleaseClause
+FROM contracts ct
+JOIN clubs c ON ct.ClubID = c.ClubID
+LEFT JOIN playerstats p ON ct.PlayerID = p.PlayerID
+LEFT JOIN goalkeeperstats g ON ct.PlayerID = g.PlayerID
+WHERE ct.DateOfEnd > :today AND ct.DateOfEnd <= :end_date
+AND (:club_id IS NULL OR ct.ClubID = :club_id)
+AND (:league IS NULL OR c.LeagueName = :league)
+ORDER BY ct.ReleaseClause DESC, ct.PlayerID
+LIMIT :limit OFFSET :offset
+""")
+
+# The current month's buckets still count contracts that ended earlier this
+# month (or were cut short by a transfer), so its row comes from the
+# contracts themselves: a range scan of at most one month on DateOfEnd
+EXPIRING_THIS_MONTH = register("expiring_this_month", """
+SELECT 
+    COUNT(*) as Contracts,
+    COALESCE(SUM(ct.ReleaseClause), 0) as TotalReleaseClause
+FROM contracts ct
+JOIN clubs c ON ct.ClubID = c.ClubID
+WHERE ct.DateOfEnd > :today AND ct.DateOfEnd < :next_month
+AND (:club_id IS NULL OR ct.ClubID = :club_id)
+AND (:league IS NULL OR c.LeagueName = :league)
+""")
+
+EXPIRY_CALENDAR = register("expiry_calendar", """
+SELECT 
+    b.ExpiryMonth,
+    SUM(b.Contracts) as Contracts,
+    SUM(b.TotalReleaseClause) as TotalReleaseClause
+FROM contractexpirybuckets b
+JOIN clubs c ON b.ClubID = c.ClubID
+WHERE b.ExpiryMonth >= :start_month AND b.ExpiryMonth < :end_month
+AND (:club_id IS NULL OR b.ClubID = :club_id)
+AND (:league IS NULL OR c.LeagueName = :league)
+GROUP BY b.ExpiryMonth
+HAVING SUM(b.Contracts) > 0
+ORDER BY b.ExpiryMonth
+""")
+
+# Base tables of the player store (shared_store.py); rows come back in ID
+# order so the store can find them by bisecting. Transfers only move
+# playerstats.ClubID, so prefer it when a keeper has a row there.
+STORE_PLAYERS = register("store_players", """
+SELECT PlayerID, Name, 'Outfield' as Position, ClubID, NationalityID, Overall, Value,
+       Pace, Shooting, Passing, Dribbling, Defending, Physical,
+       NULL as Reflexes, NULL as Diving, NULL as Handling, NULL as Positioning,
+       NULL as Speed
+FROM playerstats
+WHERE PlayerID NOT IN (SELECT PlayerID FROM goalkeeperstats)
+UNION ALL
+SELECT g.PlayerID, g.Name, 'Goalkeeper', COALESCE(p.ClubID, g.ClubID),
+       g.NationalityID, g.Overall, g.Value,
+       NULL, NULL, NULL, NULL, NULL, NULL,
+       g.Reflexes, g.Diving, g.Handling, g.Positioning, g.Speed
+FROM goalkeeperstats g
+LEFT JOIN playerstats p ON g.PlayerID = p.PlayerID
+ORDER BY PlayerID
+""")
+
+STORE_CLUBS = register("store_clubs", """
+SELECT ClubID, ClubName, LeagueName, NationalityID FROM clubs ORDER BY ClubID
+""")
+
+STORE_NATIONALITY = register("store_nationality", """
+SELECT NationalityID, NationalityName FROM nationality ORDER BY NationalityID
+""")
+
+# Change feed of player club moves; PlayerID NULL marks a bulk reload
+INSERT_CLUB_CHANGE = register("insert_club_change", """
+INSERT INTO playerclubchanges (PlayerID, ClubID) VALUES (:player_id, :club_id)
+""")
+
+LATEST_CLUB_CHANGE = register("latest_club_change", """
+SELECT COALESCE(MAX(ChangeID), 0) FROM playerclubchanges
+""")
+
+CLUB_CHANGES_SINCE = register("club_changes_since", """
+SELECT ChangeID, PlayerID, ClubID FROM playerclubchanges
+WHERE ChangeID > :after
+ORDER BY ChangeID
+""")
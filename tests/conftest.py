@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The app modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Tests that import main get an in-memory database instead of MySQL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import statements  # noqa: E402
+from shared_store import TABLES, StoreGeneration, encode_generation, generation_tables  # noqa: E402
+
+SYLLABLES = ["ka", "sa", "ra", "mo", "li", "ne", "ber", "gon", "zal", "ez", "mar", "tin", "ño"]
+
+
+class StoreData:
+    """A generated player store plus the rows it was built from."""
+
+    def __init__(self, players, clubs, nationality):
+        columns = [column for column, _ in TABLES["players"]]
+        self.players = [dict(zip(columns, row)) for row in players]
+        self.clubs = {club_id: (name, league, nation) for club_id, name, league, nation in clubs}
+        rows = {
+            statements.LATEST_CLUB_CHANGE: [(0,)],
+            statements.STORE_PLAYERS: players,
+            statements.STORE_CLUBS: clubs,
+            statements.STORE_NATIONALITY: nationality,
+        }
+        self.tables, self.meta = generation_tables(rows.__getitem__)
+        _, encoded = encode_generation(self.tables, self.meta)
+        self.generation = StoreGeneration(encoded)
+
+
+@pytest.fixture(scope="session")
+def store():
+    # Few syllables and groups, so prefixes and groups are wider than SCAN_LIMIT
+    rng = random.Random(3)
+
+    def word():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+
+    clubs = [(club_id, f"{word()} FC", f"League {club_id % 3}", club_id % 4 + 1)
+             for club_id in range(1, 5)]
+    nationality = [(nation, f"Nation {nation}") for nation in range(1, 6)]
+    players = []
+    for player_id in range(1, 3001):
+        club_id = rng.choice(clubs)[0] if rng.random() < 0.95 else None
+        name = f"{word()[0]}. {word()}" if rng.random() < 0.6 else f"{word()} {word()}"
+        common = (player_id, name, None, club_id, rng.randint(1, 5),
+                  rng.randint(50, 90), rng.randint(0, 10**6))
+        if rng.random() < 0.1:
+            stats = (None,) * 6 + tuple(rng.randint(40, 90) for _ in range(5))
+            players.append(common[:2] + ("Goalkeeper",) + common[3:] + stats)
+        else:
+            stats = tuple(rng.randint(30, 95) for _ in range(6)) + (None,) * 5
+            players.append(common[:2] + ("Outfield",) + common[3:] + stats)
+    return StoreData(players, clubs, nationality)
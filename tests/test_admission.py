@@ -0,0 +1,106 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import admission
+from admission import AdmissionLimiter
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_admits_up_to_concurrency_then_sheds_when_queue_is_full():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue_size=1, timeout=1)
+        assert await limiter.acquire() is None
+
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert len(limiter.waiters) == 1
+
+        rejection = await limiter.acquire()
+        assert rejection.status_code == 503
+        assert rejection.headers["Retry-After"]
+
+        limiter.release()
+        assert await queued is None
+        limiter.release()
+        return limiter
+
+    limiter = run(scenario())
+    assert limiter.active == 0
+    assert not limiter.waiters
+
+
+def test_queued_request_is_shed_after_its_deadline():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue_size=4, timeout=0.05)
+        assert await limiter.acquire() is None
+        rejection = await limiter.acquire()
+        assert rejection.status_code == 503
+        assert not limiter.waiters
+        limiter.release()
+        return limiter
+
+    limiter = run(scenario())
+    assert limiter.active == 0
+
+
+def test_cancel_after_grant_passes_the_slot_on():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue_size=4, timeout=1)
+        assert await limiter.acquire() is None
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # The slot is handed to the first waiter, which is cancelled before it runs.
+        # Depending on the Python version the cancellation either wins (and the
+        # limiter passes the slot on) or acquire() returns and the caller owns it.
+        limiter.release()
+        first.cancel()
+        (outcome,) = await asyncio.gather(first, return_exceptions=True)
+        if outcome is None:
+            limiter.release()
+
+        assert await asyncio.wait_for(second, 1) is None
+        assert limiter.active == 1
+        limiter.release()
+        return limiter
+
+    limiter = run(scenario())
+    assert limiter.active == 0
+    assert not limiter.waiters
+
+
+def test_cancel_while_queued_leaves_the_queue():
+    async def scenario():
+        limiter = AdmissionLimiter("test", concurrency=1, queue_size=4, timeout=1)
+        assert await limiter.acquire() is None
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert not limiter.waiters
+        limiter.release()
+        return limiter
+
+    limiter = run(scenario())
+    assert limiter.active == 0
+
+
+def test_shed_responses_carry_cors_headers(monkeypatch):
+    import main
+
+    # No slots and no queue: every expensive request is shed
+    monkeypatch.setitem(
+        admission.LIMITERS, "expensive",
+        AdmissionLimiter("expensive", concurrency=0, queue_size=0, timeout=1),
+    )
+    response = TestClient(main.app).get(
+        "/all-players", headers={"Origin": "http://localhost:3000"}
+    )
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
@@ -0,0 +1,53 @@
+from shared_store import ClubMoves
+
+
+class Generation:
+    """The fixture store's tables, as built at ``change_id``."""
+
+    def __init__(self, store, change_id):
+        self.tables = store.generation.tables
+        self.meta = {"change_id": change_id}
+
+
+def feed(*changes):
+    return lambda after: [change for change in changes if change[0] > after]
+
+
+def test_poll_publishes_the_latest_move_per_player(store):
+    moves = ClubMoves(feed((1, 7, 10), (2, 8, 20), (3, 7, 30)), lookback=0)
+    before = moves.current()
+    moves.poll(Generation(store, 0))
+    overlay = moves.current()
+    assert dict(overlay.items()) == {7: 30, 8: 20}
+    # Published overlays are never changed, so readers can hold on to them
+    assert len(before) == 0
+
+
+def test_poll_without_changes_keeps_the_overlay_and_its_index(store):
+    moves = ClubMoves(feed((1, 7, 10)), lookback=0)
+    moves.poll(Generation(store, 0))
+    overlay = moves.current()
+    moves.poll(Generation(store, 0))
+    assert moves.current() is overlay
+    assert overlay.indexed is not None
+
+
+def test_moves_the_generation_includes_are_pruned_after_the_lookback(store):
+    moves = ClubMoves(feed((1, 7, 10), (5, 8, 20), (9, 9, 30)), lookback=3)
+    moves.poll(Generation(store, 0))
+    moves.poll(Generation(store, 9))
+    assert dict(moves.current().items()) == {9: 30}
+
+
+def test_records_out_of_order_keep_the_newest_move():
+    moves = ClubMoves()
+    moves.record(5, 7, 20)
+    moves.record(4, 7, 10)
+    assert moves.current().get(7) == 20
+
+
+def test_reload_marker_makes_older_generations_stale(store):
+    moves = ClubMoves(feed((4, None, None)))
+    moves.poll(Generation(store, 0))
+    assert moves.stale(Generation(store, 3))
+    assert not moves.stale(Generation(store, 4))
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import compression
+from compression import choose_encoding
+
+
+@pytest.fixture
+def all_encoders(monkeypatch):
+    # br and zstd are optional; pretend both are installed
+    encoders = OrderedDict((name, None) for name in ("br", "zstd", "gzip"))
+    monkeypatch.setattr(compression, "ENCODERS", encoders)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0.2, zstd;q=0.8, gzip;q=0.5", "zstd"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("identity;q=0", None),
+    ("identity;q=0, gzip;q=0.1", "gzip"),
+    ("*", "br"),
+    ("*;q=0.5, br;q=0", "zstd"),
+    ("*;q=0", None),
+    ("GZIP", "gzip"),
+    ("gzip;q=high", None),
+    ("deflate", None),
+])
+def test_choose_encoding(all_encoders, accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.fixture
+def client():
+    import main
+
+    app = FastAPI()
+    app.middleware("http")(main.compress_response)
+
+    @app.get("/items")
+    def items(size: int):
+        return JSONResponse(["item"] * size, headers={"Vary": "Origin"})
+
+    return TestClient(app)
+
+
+def test_compressed_response_keeps_existing_vary(client):
+    response = client.get("/items", params={"size": 500}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
+    assert response.json() == ["item"] * 500
+
+
+@pytest.mark.parametrize("size, accept_encoding", [(500, "identity"), (1, "gzip")])
+def test_uncompressed_response_still_varies_on_encoding(client, size, accept_encoding):
+    response = client.get(
+        "/items", params={"size": size}, headers={"Accept-Encoding": accept_encoding}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
+
+
+def test_cors_origin_survives_compression():
+    import main
+
+    response = TestClient(main.app).get(
+        "/metrics",
+        headers={"Accept-Encoding": "gzip", "Origin": "http://localhost:3000"},
+    )
+    vary = {value.strip() for value in response.headers["vary"].split(",")}
+    assert {"Origin", "Accept-Encoding"} <= vary
@@ -0,0 +1,99 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import main
+from database import Base
+
+TODAY = date(2025, 3, 14)
+
+
+class FrozenDate(date):
+    """main.date with a fixed today(); constructing one gives a plain date."""
+
+    def __new__(cls, *args):
+        return date(*args)
+
+    @classmethod
+    def today(cls):
+        return TODAY
+
+
+@pytest.mark.parametrize("day, months, expected", [
+    (date(2025, 1, 31), 1, date(2025, 2, 28)),
+    (date(2024, 1, 31), 1, date(2024, 2, 29)),
+    (date(2025, 3, 31), 1, date(2025, 4, 30)),
+    (date(2025, 8, 31), 6, date(2026, 2, 28)),
+    (date(2025, 12, 15), 1, date(2026, 1, 15)),
+    (date(2025, 1, 31), 0, date(2025, 1, 31)),
+    (date(2025, 5, 31), 12, date(2026, 5, 31)),
+])
+def test_add_months_clamps_to_the_end_of_the_month(day, months, expected):
+    assert main.add_months(day, months) == expected
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE contractexpirybuckets (ClubID INTEGER, ExpiryMonth DATE, "
+            "Contracts INTEGER, TotalReleaseClause INTEGER)"
+        ))
+        connection.execute(text("INSERT INTO clubs VALUES (10, 1, 'Premier League', 'Arsenal')"))
+        contracts = [
+            # Ended earlier this month, ends (or was cut short) today, still running
+            (1, date(2025, 3, 2), 100),
+            (2, TODAY, 200),
+            (3, date(2025, 3, 20), 300),
+            (4, date(2025, 4, 10), 400),
+        ]
+        for player_id, date_of_end, release_clause in contracts:
+            connection.execute(
+                text("INSERT INTO contracts VALUES (:player_id, 10, '2020-01-01', :end, :clause)"),
+                {"player_id": player_id, "end": date_of_end, "clause": release_clause},
+            )
+        # The buckets still count all three March contracts
+        for month, contracts, total in [(date(2025, 3, 1), 3, 600), (date(2025, 4, 1), 1, 400)]:
+            connection.execute(
+                text("INSERT INTO contractexpirybuckets VALUES (10, :month, :contracts, :total)"),
+                {"month": month, "contracts": contracts, "total": total},
+            )
+
+    def read_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(main, "date", FrozenDate)
+    main.app.dependency_overrides[main.get_read_db] = read_db
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def test_expiring_lists_only_contracts_ending_after_today(client):
+    response = client.get("/contracts/expiring", params={"months": 2})
+    assert [row["PlayerID"] for row in response.json()["results"]] == [4, 3]
+
+
+def test_calendar_counts_only_contracts_ending_after_today(client):
+    response = client.get("/contracts/expiry-calendar", params={"months": 3})
+    assert [
+        (row["ExpiryMonth"], row["Contracts"], row["TotalReleaseClause"])
+        for row in response.json()
+    ] == [("2025-03-01", 1, 300), ("2025-04-01", 1, 400)]
+
+
+def test_calendar_months_bound_the_range(client):
+    response = client.get("/contracts/expiry-calendar", params={"months": 1})
+    assert [row["ExpiryMonth"] for row in response.json()] == ["2025-03-01"]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+import leaderboards
+from leaderboards import METRICS, SCOPES
+from shared_store import MovesOverlay
+
+
+def expected_top(store, metric, scope, group, limit, offset, moves=None):
+    moves = moves or {}
+
+    def group_of(record):
+        club_id = moves.get(record["PlayerID"], record["ClubID"])
+        return {
+            "global": None,
+            "league": store.clubs[club_id][1] if club_id is not None else None,
+            "club": club_id,
+            "nationality": record["NationalityID"],
+        }[scope]
+
+    ranked = sorted(
+        (record for record in store.players
+         if record[metric] is not None and group_of(record) == group),
+        key=lambda record: (-record[metric], record["PlayerID"]),
+    )
+    return [record["PlayerID"] for record in ranked[offset:offset + limit]]
+
+
+GROUPS = {"global": None, "league": "League 1", "club": 3, "nationality": 4}
+
+
+@pytest.mark.parametrize("metric", METRICS)
+@pytest.mark.parametrize("scope", SCOPES)
+def test_top_matches_brute_force(store, metric, scope):
+    group = GROUPS[scope]
+    for limit, offset in ((10, 0), (25, 40)):
+        results = leaderboards.top(
+            store.generation, MovesOverlay(), metric, scope, group, limit, offset
+        )
+        assert [row["PlayerID"] for row in results] == \
+            expected_top(store, metric, scope, group, limit, offset)
+        assert [row["Rank"] for row in results] == list(range(offset + 1, offset + 1 + len(results)))
+
+
+@pytest.mark.parametrize("scope", ["club", "league"])
+def test_moves_change_club_and_league_boards(store, scope):
+    rng = random.Random(5)
+    moves = {record["PlayerID"]: rng.randint(1, 4) for record in rng.sample(store.players, 150)}
+    overlay = MovesOverlay(moves)
+    group = GROUPS[scope]
+    for metric in ("Overall", "Pace", "Reflexes"):
+        for offset in (0, 30):
+            results = leaderboards.top(store.generation, overlay, metric, scope, group, 100, offset)
+            assert [row["PlayerID"] for row in results] == \
+                expected_top(store, metric, scope, group, 100, offset, moves)
+            for row in results:
+                if row["PlayerID"] in moves:
+                    assert row["ClubID"] == moves[row["PlayerID"]]
+
+
+def test_boards_untouched_by_moves_ignore_the_overlay(store):
+    # Moves within club 1 leave the other clubs' boards as they were built
+    moves = {record["PlayerID"]: 1 for record in store.players if record["ClubID"] == 1}
+    overlay = MovesOverlay(moves)
+    assert 3 not in overlay.index(store.generation).left["club"]
+    for offset in (0, 50, 10 ** 6):
+        results = leaderboards.top(store.generation, overlay, "Overall", "club", 3, 20, offset)
+        assert [row["PlayerID"] for row in results] == \
+            expected_top(store, "Overall", "club", 3, 20, offset, moves)
+
+
+def test_metric_names_are_case_insensitive():
+    assert leaderboards.metric_name("pace") == "Pace"
+    assert leaderboards.metric_name("speed") == "Speed"
+    assert leaderboards.metric_name("height") is None
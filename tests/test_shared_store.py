@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from shared_store import MAGIC, SharedStore, StoreGeneration, write_store
+
+
+@pytest.fixture
+def store_path(tmp_path, store):
+    path = tmp_path / "players.bin"
+    write_store(path, store.tables, store.meta)
+    return path
+
+
+def test_shared_store_maps_the_file(store, store_path):
+    generation = SharedStore(store_path).current()
+    assert len(generation.tables["players"]) == len(store.players)
+    assert generation.tables["players"].record(0) == store.generation.tables["players"].record(0)
+
+
+def damaged(path, how):
+    data = path.read_bytes()
+    if how == "empty":
+        return b""
+    if how == "short":
+        return data[:len(MAGIC) + 3]
+    if how == "old-magic":
+        return b"PLSTORE1" + data[len(MAGIC):]
+    if how == "header":
+        return data[:len(MAGIC) + 40]
+    # Columns cut off part way through the data
+    return data[:len(data) // 2]
+
+
+@pytest.mark.parametrize("how", ["empty", "short", "old-magic", "header", "columns"])
+def test_unreadable_file_is_treated_as_missing_and_rebuilt(store, store_path, how):
+    store_path.write_bytes(damaged(store_path, how))
+    with pytest.raises(ValueError):
+        StoreGeneration.open(store_path)
+
+    shared = SharedStore(store_path, lambda: (store.tables, store.meta))
+    assert shared.current() is None
+    generation = shared.ensure_built()
+    assert len(generation.tables["players"]) == len(store.players)
+    assert StoreGeneration.open(store_path).generation == generation.generation
+
+
+def test_unreadable_replacement_keeps_the_mapped_generation(store, store_path):
+    shared = SharedStore(store_path, check_interval=0)
+    generation = shared.current()
+    replacement = store_path.with_suffix(".new")
+    replacement.write_bytes(b"PLSTORE1" + bytes(64))
+    os.replace(replacement, store_path)
+    assert shared.current() is generation
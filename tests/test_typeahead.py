@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+import typeahead
+from conftest import StoreData
+from shared_store import MovesOverlay
+from typeahead import SCAN_LIMIT, fold, name_tokens
+
+QUERIES = ["k", "ka", "s", "sa", "m", "mar", "ber", "b", "b ", "b. ka", "nu", "ño", "zalez", "x"]
+
+
+def expected_players(store, query, limit, club_id=None, nationality_id=None, moves=None):
+    moves = moves or {}
+    prefix = fold(query)
+    matches = [
+        record for record in store.players
+        if any(token.startswith(prefix) for token in name_tokens(record["Name"]))
+        and (club_id is None or moves.get(record["PlayerID"], record["ClubID"]) == club_id)
+        and (nationality_id is None or record["NationalityID"] == nationality_id)
+    ]
+    matches.sort(key=lambda record: (-(record["Overall"] or 0), record["PlayerID"]))
+    return [record["PlayerID"] for record in matches[:limit]]
+
+
+def suggested_players(store, query, limit, club_id=None, nationality_id=None, moves=None):
+    results = typeahead.suggest(
+        store.generation, MovesOverlay(moves), query, limit, ("player",), club_id, nationality_id
+    )
+    return [player["PlayerID"] for player in results["player"]]
+
+
+def test_fold_ignores_accents_case_and_punctuation():
+    assert fold("Núñez") == "nunez"
+    assert name_tokens("B. Saka") == ["b", "saka", "b saka"]
+
+
+@pytest.mark.parametrize("name, folded", [
+    ("Martin Ødegaard", "martin odegaard"),
+    ("Novak Đoković", "novak dokovic"),
+    ("Kasper Jørgensen", "kasper jorgensen"),
+    ("Łukasz Fabiański", "lukasz fabianski"),
+    ("Thomas Müßig", "thomas mussig"),
+    ("İlkay Gündoğan", "ilkay gundogan"),
+    ("Son Heung-min", "son heung min"),
+    ("孫興慜", "孫興慜"),
+    ("Kubo_Takefusa", "kubo takefusa"),
+])
+def test_fold_keeps_every_letter(name, folded):
+    assert fold(name) == folded
+
+
+def test_transliterated_and_non_latin_names_are_found():
+    names = ["Martin Ødegaard", "Novak Đoković", "Kasper Jørgensen", "孫興慜"]
+    players = [
+        (player_id, name, "Outfield", 1, 1, 80, 1000) + (70,) * 6 + (None,) * 5
+        for player_id, name in enumerate(names, start=1)
+    ]
+    small = StoreData(players, [(1, "Club", "League", 1)], [(1, "Nation")])
+    for query, expected in [("ode", 1), ("Ødeg", 1), ("djo", None), ("dok", 2),
+                            ("jor", 3), ("Jørg", 3), ("孫", 4), ("孫興", 4)]:
+        results = typeahead.suggest(small.generation, MovesOverlay(), query, 10, ("player",))
+        found = [player["PlayerID"] for player in results["player"]]
+        assert found == ([expected] if expected else []), query
+
+
+def test_fixture_has_prefixes_wider_than_the_scan_limit(store):
+    prefix = fold(QUERIES[0])
+    wide = sum(
+        any(token.startswith(prefix) for token in name_tokens(record["Name"]))
+        for record in store.players
+    )
+    assert wide > SCAN_LIMIT
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("limit", [1, 10, 50])
+def test_unfiltered_ranking_matches_brute_force(store, query, limit):
+    assert suggested_players(store, query, limit) == expected_players(store, query, limit)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_filters_match_brute_force(store, query):
+    for club_id in (None, 1, 4):
+        for nationality_id in (None, 2, 5):
+            assert suggested_players(store, query, 20, club_id, nationality_id) == \
+                expected_players(store, query, 20, club_id, nationality_id)
+
+
+def test_club_filter_follows_moves(store):
+    rng = random.Random(11)
+    moves = {
+        record["PlayerID"]: rng.randint(1, 4) for record in rng.sample(store.players, 200)
+    }
+    for query in QUERIES:
+        for club_id in (1, 2, 4):
+            for nationality_id in (None, 3):
+                assert suggested_players(store, query, 30, club_id, nationality_id, moves) == \
+                    expected_players(store, query, 30, club_id, nationality_id, moves)
+
+
+def test_moved_player_is_reported_at_the_new_club(store):
+    record = next(record for record in store.players if record["ClubID"] == 2)
+    moves = {record["PlayerID"]: 3}
+    query = fold(record["Name"])
+    assert record["PlayerID"] not in suggested_players(store, query, 50, 2, moves=moves)
+    results = typeahead.suggest(
+        store.generation, MovesOverlay(moves), query, 50, ("player",), 3
+    )["player"]
+    moved = [player for player in results if player["PlayerID"] == record["PlayerID"]]
+    assert moved and moved[0]["ClubID"] == 3
+
+
+def test_clubs_rank_by_average_squad_rating(store):
+    results = typeahead.suggest(store.generation, {}, "f", 50, ("club",))["club"]
+    ratings = {}
+    for record in store.players:
+        if record["ClubID"] is not None:
+            ratings.setdefault(record["ClubID"], []).append(record["Overall"])
+    expected = sorted(
+        (club_id for club_id in store.clubs if ratings.get(club_id)),
+        key=lambda club_id: (-round(sum(ratings[club_id]) / len(ratings[club_id])), club_id),
+    )
+    assert [club["ClubID"] for club in results] == expected
+
+
+def test_blank_query_returns_nothing(store):
+    assert typeahead.suggest(store.generation, {}, " .. ", 10) == {"player": [], "club": []}
@@ -0,0 +1,288 @@
+"""Prefix suggestions for player and club names, read from the player store.
+
+Names are folded (accents stripped, letters like ø and ß transliterated,
+case-folded, punctuation dropped) and split into tokens. Entries are numbered by rank (best Overall first), and each kind
+of entity gets tables in the store generation (see shared_store.py):
+
+- ``typeahead_{kind}_ranked``: base-table row, rating and folded name by rank
+- ``typeahead_{kind}_rank``: rank by base-table row
+- ``typeahead_{kind}_{partition}_tokens``: (Group, Token, Rank) sorted, so the
+  entries for a prefix within one group are a contiguous range found with
+  bisects. Partition ``all`` has a single group; ``club`` and ``nationality``
+  have one group per club/nationality, so a filtered query only searches its
+  own group's tokens.
+- ``typeahead_{kind}_{partition}_top``: the best ranks of every prefix whose
+  range within a group is too wide to rank per request
+
+A narrow range is ranked by sorting small ints and a wide one reads its top
+list, so every query costs a few bisects plus at most SCAN_LIMIT entries.
+Transfers since the generation was built come in as a MovesOverlay and only
+affect the club filter.
+"""
+
+import bisect
+import heapq
+import re
+import unicodedata
+from array import array
+
+# Prefix ranges up to this size are ranked directly; wider ones use top lists
+SCAN_LIMIT = 256
+# The /suggest limit cap; top lists keep this many ranks per prefix
+TOP_LIST_DEPTH = 50
+PREFIX_END = "\U0010ffff"
+
+# Kind -> (base table, ID column)
+KINDS = {
+    "player": ("players", "PlayerID"),
+    "club": ("clubs", "ClubID"),
+}
+
+# Letters NFKD leaves whole, spelled the way they're usually typed in ASCII
+_TRANSLITERATIONS = str.maketrans({
+    "ø": "o", "ł": "l", "đ": "d", "ð": "d", "ħ": "h", "ı": "i",
+    "æ": "ae", "œ": "oe", "þ": "th", "ß": "ss",
+})
+# Anything but a letter or digit in any script
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold(text):
+    transliterated = (text or "").casefold().translate(_TRANSLITERATIONS)
+    decomposed = unicodedata.normalize("NFKD", transliterated)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped).strip()
+
+
+def folded_tokens(folded):
+    tokens = folded.split()
+    # The whole name as well, so "b sa" finds "B. Saka"
+    if len(tokens) > 1:
+        tokens.append(folded)
+    return list(dict.fromkeys(tokens))
+
+
+def name_tokens(name):
+    return folded_tokens(fold(name))
+
+
+def wide_prefixes(tokens, ranks, low, high):
+    """(prefix, best ranks) for every prefix of tokens[low:high] wider than SCAN_LIMIT."""
+    pending = [("", low, high)] if high - low > SCAN_LIMIT else []
+    while pending:
+        prefix, low, high = pending.pop()
+        if prefix:
+            yield prefix, heapq.nsmallest(TOP_LIST_DEPTH, set(ranks[low:high]))
+        depth = len(prefix)
+        # A token equal to the prefix sorts first and has no longer prefixes
+        index = low
+        while index < high and len(tokens[index]) == depth:
+            index += 1
+        while index < high:
+            child = tokens[index][:depth + 1]
+            end = bisect.bisect_left(tokens, child + PREFIX_END, index, high)
+            if end - index > SCAN_LIMIT:
+                pending.append((child, index, end))
+            index = end
+
+
+def prefix_tables(name, entries):
+    """Token and top-list tables from sorted (group, token, rank) entries."""
+    groups = [group for group, _, _ in entries]
+    tokens = [token for _, token, _ in entries]
+    ranks = array("q", (rank for _, _, rank in entries))
+    top = []
+    start = 0
+    while start < len(entries):
+        end = bisect.bisect_right(groups, groups[start], start)
+        for prefix, best in wide_prefixes(tokens, ranks, start, end):
+            top.extend((groups[start], prefix, rank) for rank in best)
+        start = end
+    top.sort()
+    return {
+        f"{name}_tokens": [("Group", "int", groups), ("Token", "str", tokens), ("Rank", "int", ranks)],
+        f"{name}_top": [
+            ("Group", "int", [group for group, _, _ in top]),
+            ("Prefix", "str", [prefix for _, prefix, _ in top]),
+            ("Rank", "int", array("q", (rank for _, _, rank in top))),
+        ],
+    }
+
+
+def kind_tables(kind, ids, names, ratings, groups):
+    name = f"typeahead_{kind}"
+    # Rank 0 is the best rated entry; ties go to the lower ID
+    order = sorted(range(len(ids)), key=lambda row: (-(ratings[row] or 0), ids[row]))
+    rank_of = array("q", bytes(8 * len(ids)))
+    for rank, row in enumerate(order):
+        rank_of[row] = rank
+    folded = [fold(names[row]) for row in order]
+    tables = {
+        f"{name}_ranked": [
+            ("Row", "int", array("q", order)),
+            ("Rating", "int", [ratings[row] for row in order]),
+            ("Folded", "str", folded),
+        ],
+        f"{name}_rank": [("Rank", "int", rank_of)],
+    }
+    tokens = [folded_tokens(text) for text in folded]
+    # One partition for all entries, then one per club and per nationality,
+    # so filtered queries search only their own group's tokens
+    partitions = {"all": [0] * len(ids), **groups}
+    for partition, keys in partitions.items():
+        entries = sorted(
+            (keys[row], token, rank)
+            for rank, row in enumerate(order) if keys[row] is not None
+            for token in tokens[rank]
+        )
+        tables.update(prefix_tables(f"{name}_{partition}", entries))
+    return tables
+
+
+def index_tables(players, clubs):
+    """Typeahead tables for a store generation, from the base tables' columns."""
+    # Clubs rank by the average Overall of their squad
+    squad_ratings = {}
+    for club_id, overall in zip(players["ClubID"], players["Overall"]):
+        if club_id is not None and overall is not None:
+            squad_ratings.setdefault(club_id, []).append(overall)
+    club_ratings = []
+    for club_id in clubs["ClubID"]:
+        ratings = squad_ratings.get(club_id)
+        club_ratings.append(round(sum(ratings) / len(ratings)) if ratings else None)
+
+    tables = kind_tables(
+        "player", players["PlayerID"], players["Name"], players["Overall"],
+        {"club": players["ClubID"], "nationality": players["NationalityID"]},
+    )
+    tables.update(kind_tables(
+        "club", clubs["ClubID"], clubs["ClubName"], club_ratings,
+        {"club": clubs["ClubID"], "nationality": clubs["NationalityID"]},
+    ))
+    return tables
+
+
+class KindIndex:
+    """One kind's typeahead tables in a generation, plus the transfer overlay."""
+
+    def __init__(self, generation, kind, moves):
+        table, self.id_column = KINDS[kind]
+        self.name = f"typeahead_{kind}"
+        self.generation = generation
+        self.base = generation.tables[table]
+        self.ids = self.base.columns[self.id_column]
+        self.ranked = generation.tables[f"{self.name}_ranked"]
+        self.rows = self.ranked.columns["Row"].values
+        self.moves = moves if kind == "player" else {}
+
+    def club_of(self, rank):
+        row = self.rows[rank]
+        club_id = self.base.columns["ClubID"][row]
+        return self.moves.get(self.ids.values[row], club_id) if self.moves else club_id
+
+    def matches(self, rank, club_id, nationality_id):
+        return (
+            (club_id is None or self.club_of(rank) == club_id)
+            and (nationality_id is None
+                 or self.base.columns["NationalityID"][self.rows[rank]] == nationality_id)
+        )
+
+    def prefix_range(self, partition, group, prefix):
+        tokens = self.generation.tables[f"{self.name}_{partition}_tokens"]
+        group_low, group_high = tokens.span("Group", group)
+        column = tokens.columns["Token"]
+        low = bisect.bisect_left(column, prefix, group_low, group_high)
+        return tokens, low, bisect.bisect_left(column, prefix + PREFIX_END, low, group_high)
+
+    def candidates(self, partition, group, prefix):
+        """Ranks in ``group`` with a token starting with ``prefix``, best first."""
+        tokens, low, high = self.prefix_range(partition, group, prefix)
+        ranks = tokens.columns["Rank"].values
+        if high - low <= SCAN_LIMIT:
+            yield from sorted(set(ranks[low:high]))
+            return
+        top = self.generation.tables[f"{self.name}_{partition}_top"]
+        group_low, group_high = top.span("Group", group)
+        start, end = top.span("Prefix", prefix, group_low, group_high)
+        listed = top.columns["Rank"].values[start:end].tolist()
+        yield from listed
+        if len(listed) == TOP_LIST_DEPTH:
+            # Filtered past the end of the list: carry on through the whole range
+            yield from (rank for rank in sorted(set(ranks[low:high])) if rank > listed[-1])
+
+    def joined(self, club_id, prefix):
+        """Ranks of players moved into ``club_id`` since the build, with a matching token."""
+        rank_of = self.generation.tables[f"{self.name}_rank"].columns["Rank"].values
+        rows = self.moves.index(self.generation).joined["club"].get(club_id, ())
+        return sorted(rank_of[row] for row in rows if self.has_prefix(rank_of[row], prefix))
+
+    def has_prefix(self, rank, prefix):
+        folded = self.ranked.columns["Folded"][rank] or ""
+        return any(token.startswith(prefix) for token in folded_tokens(folded))
+
+    def search(self, prefix, limit, club_id=None, nationality_id=None):
+        """Ranks of the entries with a token starting with ``prefix``, best first."""
+        # Search the narrowest partition the filters allow
+        if club_id is not None:
+            partition, group = "club", club_id
+        elif nationality_id is not None:
+            partition, group = "nationality", nationality_id
+        else:
+            partition, group = "all", 0
+        candidates = self.candidates(partition, group, prefix)
+        if partition == "club" and self.moves:
+            # Players who left fail the club check below; merge in those who joined
+            joined = self.joined(club_id, prefix)
+            candidates = heapq.merge(
+                (rank for rank in candidates if rank not in joined), joined
+            )
+
+        results = []
+        for rank in candidates:
+            if self.matches(rank, club_id, nationality_id):
+                results.append(rank)
+                if len(results) == limit:
+                    break
+        return results
+
+
+def suggest(generation, moves, query, limit=10, kinds=("player", "club"),
+            club_id=None, nationality_id=None):
+    prefix = fold(query)
+    if not prefix:
+        return {kind: [] for kind in kinds}
+    results = {}
+    if "player" in kinds:
+        index = KindIndex(generation, "player", moves)
+        columns = index.base.columns
+        results["player"] = [
+            {
+                "PlayerID": index.ids[row],
+                "Name": columns["Name"][row],
+                "Position": columns["Position"][row],
+                "ClubID": index.club_of(rank),
+                "NationalityID": columns["NationalityID"][row],
+                "Overall": index.ranked.columns["Rating"][rank],
+            }
+            for rank, row in (
+                (rank, index.rows[rank])
+                for rank in index.search(prefix, limit, club_id, nationality_id)
+            )
+        ]
+    if "club" in kinds:
+        index = KindIndex(generation, "club", moves)
+        columns = index.base.columns
+        results["club"] = [
+            {
+                "ClubID": index.ids[row],
+                "ClubName": columns["ClubName"][row],
+                "LeagueName": columns["LeagueName"][row],
+                "NationalityID": columns["NationalityID"][row],
+                "AverageOverall": index.ranked.columns["Rating"][rank],
+            }
+            for rank, row in (
+                (rank, index.rows[rank])
+                for rank in index.search(prefix, limit, club_id, nationality_id)
+            )
+        ]
+    return results
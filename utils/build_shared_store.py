@@ -0,0 +1,81 @@
+"""Build the memory-mapped player store the API workers share.
+
+    python -m utils.build_shared_store stores/players.bin
+    python -m utils.build_shared_store stores/players.bin --interval 60
+
+The store holds the player tables and the leaderboard/typeahead indexes, so
+workers only map it. Run it once after loading data, or with --interval as a
+supervisor process that rebuilds it whenever the club change feed has moved on
+(a transfer or a data reload); workers remap the new generation within
+SHARED_STORE_CHECK_INTERVAL seconds.
+"""
+
+import argparse
+import time
+
+from .db_connect import get_connection
+import statements
+from shared_store import TABLES, generation_tables, write_store
+
+BATCH_SIZE = 10000
+
+
+def fetch_rows(conn, statement):
+    cursor = conn.cursor()
+    cursor.execute(statement.text)
+    rows = []
+    while True:
+        batch = cursor.fetchmany(BATCH_SIZE)
+        if not batch:
+            break
+        rows.extend(batch)
+    cursor.close()
+    return rows
+
+
+def build(path):
+    conn = get_connection()
+    try:
+        tables, meta = generation_tables(lambda statement: fetch_rows(conn, statement))
+    finally:
+        conn.close()
+    generation = write_store(path, tables, meta)
+    return generation, meta["change_id"], {table: len(tables[table][0][2]) for table in TABLES}
+
+
+def latest_change():
+    conn = get_connection()
+    try:
+        return fetch_rows(conn, statements.LATEST_CLUB_CHANGE)[0][0]
+    finally:
+        conn.close()
+
+
+def main(path, interval=None):
+    built_change = None
+    while True:
+        # Workers layer club moves on top of the store themselves, so only
+        # rebuild once something has changed since the last generation
+        if built_change is None or latest_change() != built_change:
+            start = time.perf_counter()
+            generation, built_change, counts = build(path)
+            for table, count in counts.items():
+                print(f"  {table}: {count} rows")
+            print(
+                f"✅ Store generation {generation} written to {path} "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+        if not interval:
+            break
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default="stores/players.bin")
+    parser.add_argument(
+        "--interval", type=float, default=None,
+        help="Keep running and check for changes every INTERVAL seconds",
+    )
+    args = parser.parse_args()
+    main(args.path, args.interval)
@@ -0,0 +1,154 @@
+"""Export the read-only tables to an embedded SQLite snapshot.
+
+    python -m utils.export_snapshot snapshots/playerdb.sqlite
+
+The file is built next to the target and moved into place with os.replace,
+so an app serving from the snapshot (SNAPSHOT_PATH) switches to the new file
+atomically and never sees a half-written one.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from .db_connect import get_connection
+
+BATCH_SIZE = 10000
+
+# Table -> (SQLite column definitions, secondary indexes as column or tuple)
+SNAPSHOT_TABLES = {
+    "nationality": (
+        "NationalityID INTEGER PRIMARY KEY, NationalityName TEXT",
+        ["NationalityName"],
+    ),
+    "clubs": (
+        "ClubID INTEGER PRIMARY KEY, NationalityID INTEGER, LeagueName TEXT, ClubName TEXT",
+        ["NationalityID", "ClubName"],
+    ),
+    "playerstats": (
+        "PlayerID INTEGER PRIMARY KEY, NationalityID INTEGER, DOB TEXT, Overall INTEGER, "
+        "Value INTEGER, Name TEXT, ClubID INTEGER, Pace INTEGER, Physical INTEGER, "
+        "Shooting INTEGER, Passing INTEGER, Dribbling INTEGER, Defending INTEGER",
+        ["ClubID", "NationalityID", "Name"],
+    ),
+    "goalkeeperstats": (
+        "PlayerID INTEGER PRIMARY KEY, NationalityID INTEGER, DOB TEXT, Overall INTEGER, "
+        "Value INTEGER, Name TEXT, ClubID INTEGER, Reflexes INTEGER, Diving INTEGER, "
+        "Speed INTEGER, Positioning INTEGER, Handling INTEGER",
+        ["ClubID", "NationalityID", "Name"],
+    ),
+    "outfieldstats": (
+        "PlayerID INTEGER PRIMARY KEY, Pace REAL, Shooting REAL, Passing REAL, "
+        "Dribbling REAL, Defending REAL, Physical REAL",
+        [],
+    ),
+    "contracts": (
+        "ContractID INTEGER PRIMARY KEY, PlayerID INTEGER, ClubID INTEGER, "
+        "DateOfJoin TEXT, DateOfEnd TEXT, ReleaseClause INTEGER",
+        ["PlayerID", "ClubID", "DateOfEnd"],
+    ),
+    "playerratinghistory": (
+        "PlayerID INTEGER NOT NULL, FifaVersion INTEGER NOT NULL, "
+        "FifaUpdate INTEGER NOT NULL, ClubID INTEGER, Overall INTEGER, Value INTEGER, "
+        "ValidUntil INTEGER NOT NULL",
+        [
+            ("PlayerID", "FifaVersion", "FifaUpdate"),
+            ("ValidUntil", "FifaVersion", "FifaUpdate"),
+            ("ClubID", "ValidUntil"),
+        ],
+    ),
+    "contractexpirybuckets": (
+        "ClubID INTEGER NOT NULL, ExpiryMonth TEXT NOT NULL, Contracts INTEGER, "
+        "TotalReleaseClause INTEGER",
+        [("ClubID", "ExpiryMonth"), "ExpiryMonth"],
+    ),
+}
+
+
+def to_sqlite(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def copy_table(source, target, table, columns):
+    column_names = [c.strip().split()[0] for c in columns.split(",")]
+    cursor = source.cursor()
+    cursor.execute(f"SELECT {', '.join(column_names)} FROM {table}")
+    insert = (
+        f"INSERT INTO {table} ({', '.join(column_names)}) "
+        f"VALUES ({', '.join('?' for _ in column_names)})"
+    )
+    copied = 0
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        target.executemany(insert, [tuple(to_sqlite(v) for v in row) for row in rows])
+        copied += len(rows)
+    cursor.close()
+    return copied
+
+
+def export(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".sqlite", dir=directory)
+    os.close(fd)
+
+    source = get_connection()
+    target = sqlite3.connect(tmp_path)
+    try:
+        target.execute("PRAGMA journal_mode=OFF")
+        target.execute("PRAGMA synchronous=OFF")
+        target.execute("PRAGMA page_size=8192")
+
+        counts = {}
+        for table, (columns, indexes) in SNAPSHOT_TABLES.items():
+            target.execute(f"CREATE TABLE {table} ({columns})")
+            counts[table] = copy_table(source, target, table, columns)
+            for index in indexes:
+                index_columns = (index,) if isinstance(index, str) else index
+                target.execute(
+                    f"CREATE INDEX ix_{table}_{'_'.join(index_columns)} "
+                    f"ON {table} ({', '.join(index_columns)})"
+                )
+
+        target.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+        target.execute(
+            "INSERT INTO snapshot_meta VALUES ('exported_at', ?)",
+            (datetime.utcnow().isoformat(timespec="seconds"),),
+        )
+        target.commit()
+        target.execute("ANALYZE")
+        target.commit()
+    except BaseException:
+        target.close()
+        os.unlink(tmp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return counts
+
+
+def main(path):
+    start = time.perf_counter()
+    counts = export(path)
+    for table, count in counts.items():
+        print(f"  {table}: {count} rows")
+    print(f"✅ Snapshot written to {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "snapshots/playerdb.sqlite")
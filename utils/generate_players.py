@@ -0,0 +1,290 @@
+"""Deterministic synthetic male_players.csv generator.
+
+Writes files with the columns utils/load_data.py reads, so the loader and the
+API can be exercised without the real dataset and at arbitrary sizes:
+
+    python -m utils.generate_players --rows 100000 --seed 7 --output players.csv
+    python -m utils.generate_players --rows 5000 --versions 22,23,24 --output history.csv
+
+Rows are streamed to disk one at a time. Every player is derived from
+``(seed, player_id)`` (and the version for per-version drift), so the output
+is reproducible and memory use does not grow with the row count.
+"""
+
+import argparse
+import bisect
+import csv
+import math
+import random
+import sys
+from datetime import date, timedelta
+
+COLUMNS = [
+    "player_id",
+    "fifa_version",
+    "fifa_update",
+    "short_name",
+    "player_positions",
+    "overall",
+    "value_eur",
+    "dob",
+    "club_team_id",
+    "club_name",
+    "league_name",
+    "club_joined_date",
+    "club_contract_valid_until_year",
+    "nationality_id",
+    "nationality_name",
+    "release_clause_eur",
+    "pace",
+    "shooting",
+    "passing",
+    "dribbling",
+    "defending",
+    "physic",
+    "goalkeeping_diving",
+    "goalkeeping_handling",
+    "goalkeeping_positioning",
+    "goalkeeping_reflexes",
+    "goalkeeping_speed",
+]
+
+# (NationalityID, NationalityName, relative weight)
+NATIONALITIES = [
+    (14, "England", 120), (21, "Germany", 90), (45, "Spain", 90),
+    (18, "France", 85), (52, "Argentina", 70), (54, "Brazil", 65),
+    (27, "Italy", 60), (34, "Netherlands", 35), (38, "Portugal", 30),
+    (7, "Belgium", 25), (42, "Scotland", 25), (46, "Sweden", 22),
+    (47, "Switzerland", 20), (13, "Denmark", 20), (36, "Norway", 20),
+    (37, "Poland", 20), (25, "Republic of Ireland", 20), (56, "Colombia", 20),
+    (83, "Mexico", 25), (95, "United States", 25), (48, "Türkiye", 18),
+    (40, "Russia", 15), (10, "Croatia", 12), (51, "Serbia", 12),
+    (167, "Korea Republic", 12), (163, "Japan", 20), (155, "China PR", 12),
+    (60, "Uruguay", 12), (55, "Chile", 10), (195, "Australia", 12),
+    (136, "Nigeria", 10), (117, "Ghana", 8), (108, "Senegal", 8),
+    (103, "Ivory Coast", 8), (111, "Cameroon", 7), (129, "Morocco", 7),
+    (4, "Austria", 15), (12, "Czech Republic", 8), (50, "Wales", 8),
+    (23, "Hungary", 6),
+]
+
+# (LeagueName, country NationalityID, number of clubs)
+LEAGUES = [
+    ("Premier League", 14, 20), ("Championship", 14, 24), ("League One", 14, 24),
+    ("Bundesliga", 21, 18), ("2. Bundesliga", 21, 18), ("La Liga", 45, 20),
+    ("La Liga 2", 45, 22), ("Ligue 1", 18, 18), ("Ligue 2", 18, 20),
+    ("Serie A", 27, 20), ("Serie B", 27, 20), ("Eredivisie", 34, 18),
+    ("Liga Portugal", 38, 18), ("Pro League", 7, 16), ("Premiership", 42, 12),
+    ("Allsvenskan", 46, 16), ("Super League", 47, 10), ("Superliga", 13, 12),
+    ("Eliteserien", 36, 16), ("Ekstraklasa", 37, 18), ("Major League Soccer", 95, 29),
+    ("Liga MX", 83, 18), ("Süper Lig", 48, 20), ("Liga Profesional", 52, 28),
+    ("Série A", 54, 20), ("K League 1", 167, 12), ("J1 League", 163, 18),
+    ("Chinese Super League", 155, 16), ("A-League", 195, 12),
+]
+
+CLUB_SUFFIXES = ["FC", "United", "City", "Athletic", "Rovers", "SC", "CF", "AC", "Sporting", "Real"]
+TOWNS = [
+    "North", "South", "East", "West", "Port", "Saint", "New", "Old", "Lake", "River",
+    "Bridge", "Castle", "Forest", "Hill", "Green", "Kings", "Queens", "Union", "Vale", "Borough",
+]
+FIRST_INITIALS = "ABCDEFGHIJKLMNOPRSTVWY"
+SURNAMES = [
+    "Smith", "Müller", "García", "Silva", "Rossi", "Martin", "Jansen", "Santos",
+    "Fernández", "Hernández", "Kim", "Nakamura", "Kowalski", "Novak", "Petrović",
+    "Johansson", "Larsen", "O'Brien", "Murphy", "Dubois", "Lefèvre", "Schmidt",
+    "Costa", "Pereira", "Rodríguez", "López", "González", "Yılmaz", "Kaya", "Diallo",
+    "Traoré", "Mensah", "Okafor", "Walker", "Wright", "Clarke", "Bianchi", "Romano",
+    "De Jong", "Van Dijk", "Jørgensen", "Nielsen", "Ivanov", "Horvat", "Modrić",
+]
+
+# (position string, relative weight); roughly one goalkeeper per nine players
+POSITIONS = [
+    ("GK", 11), ("CB", 17), ("LB", 4), ("RB", 4), ("LB, LWB", 2), ("RB, RWB", 2),
+    ("CDM, CM", 8), ("CM", 10), ("CM, CAM", 7), ("CAM", 6), ("LM, LW", 4),
+    ("RM, RW", 4), ("LW, ST", 3), ("RW, ST", 3), ("ST", 10), ("ST, CF", 3), ("CF", 2),
+]
+
+# Fraction of rows without a club (free agents), without a joined date, and
+# with no release clause in the source data
+FREE_AGENT_RATE = 0.015
+MISSING_JOINED_RATE = 0.05
+MISSING_RELEASE_CLAUSE_RATE = 0.08
+
+
+# Keep squads at a realistic size by adding regional leagues for big files
+PLAYERS_PER_CLUB = 30
+REGIONAL_LEAGUE_SIZE = 20
+
+
+def build_clubs(min_clubs=0):
+    leagues = list(LEAGUES)
+    total = sum(count for _, _, count in leagues)
+    regional = 1
+    while total < min_clubs:
+        country_id = NATIONALITIES[regional % len(NATIONALITIES)][0]
+        leagues.append((f"Regional League {regional}", country_id, REGIONAL_LEAGUE_SIZE))
+        total += REGIONAL_LEAGUE_SIZE
+        regional += 1
+
+    clubs = []
+    club_id = 1
+    for league, country_id, count in leagues:
+        for i in range(count):
+            rng = random.Random(f"club:{club_id}")
+            name = f"{rng.choice(TOWNS)} {rng.choice(TOWNS)}ton {rng.choice(CLUB_SUFFIXES)}"
+            # Club prestige skews the ability of its squad
+            prestige = 1.0 - i / count
+            clubs.append((club_id, name, league, country_id, prestige))
+            club_id += 1
+    return clubs
+
+
+def weighted_choice(rng, items, cumulative):
+    index = bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+    return items[min(index, len(items) - 1)]
+
+
+def cumulative(weights):
+    total = 0
+    out = []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+
+def clamp(value, low=1, high=99):
+    return max(low, min(high, int(round(value))))
+
+
+def value_for(overall, age, rng):
+    # Market value grows roughly exponentially with ability and drops with age
+    base = 10_000 * math.exp((overall - 45) / 6.5)
+    age_factor = 1.25 if age < 24 else (1.0 if age < 30 else 0.55)
+    return int(round(base * age_factor * rng.uniform(0.8, 1.2), -3))
+
+
+class Generator:
+    def __init__(self, seed=0, rows=0):
+        self.seed = seed
+        self.clubs = build_clubs(rows // PLAYERS_PER_CLUB)
+        self.nationalities = NATIONALITIES
+        self.nationality_weights = cumulative(w for _, _, w in NATIONALITIES)
+        self.position_weights = cumulative(w for _, w in POSITIONS)
+
+    def base_player(self, player_id):
+        rng = random.Random(f"{self.seed}:{player_id}")
+        nationality_id, nationality_name, _ = weighted_choice(
+            rng, self.nationalities, self.nationality_weights
+        )
+        positions = weighted_choice(rng, POSITIONS, self.position_weights)[0]
+        club = rng.choice(self.clubs)
+        born = date(1980, 1, 1) + timedelta(days=rng.randint(0, 26 * 365))
+        talent = rng.gauss(0, 1)
+        name = f"{rng.choice(FIRST_INITIALS)}. {rng.choice(SURNAMES)}"
+        return {
+            "player_id": player_id,
+            "short_name": name,
+            "player_positions": positions,
+            "dob": born,
+            "nationality_id": nationality_id,
+            "nationality_name": nationality_name,
+            "club": club,
+            "talent": talent,
+            "free_agent": rng.random() < FREE_AGENT_RATE,
+        }
+
+    def row(self, base, version, update):
+        rng = random.Random(f"{self.seed}:{base['player_id']}:{version}:{update}")
+        season_year = 2000 + version
+        age = season_year - base["dob"].year
+
+        # Ability peaks in the late twenties; the club's prestige pulls it up
+        club = base["club"]
+        if rng.random() < 0.15:
+            # Moved club in this version
+            club = self.clubs[rng.randrange(len(self.clubs))]
+        peak = 66 + 7 * base["talent"] + 6 * club[4]
+        overall = clamp(peak - 0.35 * abs(age - 28) ** 1.3 + rng.gauss(0, 1.5), 40, 94)
+
+        is_goalkeeper = base["player_positions"].startswith("GK")
+        free_agent = base["free_agent"]
+
+        def stat(offset, spread=6):
+            return clamp(overall + offset + rng.gauss(0, spread))
+
+        if is_goalkeeper:
+            outfield = [""] * 6
+            goalkeeping = [stat(2), stat(0), stat(1), stat(3), stat(-20, 10)]
+        else:
+            outfield = [stat(3, 10), stat(-3, 12), stat(0, 8), stat(2, 9), stat(-8, 15), stat(0, 8)]
+            goalkeeping = [clamp(rng.gauss(11, 3)) for _ in range(5)]
+
+        value = value_for(overall, age, rng)
+        if free_agent:
+            club_fields = ["", "", "", "", ""]
+            release_clause = ""
+        else:
+            joined = ""
+            if rng.random() >= MISSING_JOINED_RATE:
+                joined = date(season_year - rng.randint(0, 5), rng.choice([1, 7, 8]), 1)
+            until = season_year + rng.randint(0, 5)
+            club_fields = [club[0], club[1], club[2], joined, until]
+            release_clause = ""
+            if rng.random() >= MISSING_RELEASE_CLAUSE_RATE:
+                release_clause = int(round(value * rng.uniform(1.6, 2.2), -3))
+
+        return (
+            [
+                base["player_id"],
+                version,
+                update,
+                base["short_name"],
+                base["player_positions"],
+                overall,
+                value,
+                base["dob"],
+            ]
+            + club_fields
+            + [base["nationality_id"], base["nationality_name"], release_clause]
+            + outfield
+            + goalkeeping
+        )
+
+    def rows(self, count, versions=(24,), updates=1):
+        # Newest version first: the loader keeps the first row it sees per player
+        for version in sorted(versions, reverse=True):
+            for update in range(updates, 0, -1):
+                for player_id in range(1, count + 1):
+                    yield self.row(self.base_player(player_id), version, update)
+
+
+def generate(path, rows, seed=0, versions=(24,), updates=1):
+    """Write ``rows`` players (per version/update) to ``path``."""
+    generator = Generator(seed, rows)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(generator.rows(rows, versions, updates))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic male_players.csv")
+    parser.add_argument("--rows", type=int, required=True, help="players per version")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--versions", default="24",
+                        help="comma separated FIFA versions, e.g. 22,23,24")
+    parser.add_argument("--updates", type=int, default=1, help="updates per version")
+    parser.add_argument("--output", default="-", help="output path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    versions = [int(v) for v in args.versions.split(",")]
+    if args.output == "-":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(COLUMNS)
+        writer.writerows(Generator(args.seed, args.rows).rows(args.rows, versions, args.updates))
+    else:
+        generate(args.output, args.rows, args.seed, versions, args.updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .db_connect import get_connection
+from statements import HISTORY_OPEN_ENDED, HISTORY_UPDATE_SCALE
 
 
 def main():
@@ -14,6 +15,9 @@ def main():
 
     for stmt in TABLES:
         cursor.execute(stmt)
+    ensure_indexes(cursor)
+    rebuild_expiry_buckets(cursor)
+    rebuild_history_validity(cursor)
 
     conn.commit()
     cursor.close()
@@ -86,11 +90,119 @@ TABLES = [
         DateOfEnd DATE,
         ReleaseClause INT,
         UNIQUE KEY (PlayerID, ClubID),
+        KEY ix_contracts_end (DateOfEnd),
+        KEY ix_contracts_player_end (PlayerID, DateOfEnd),
         FOREIGN KEY (PlayerID) REFERENCES PlayerStats(PlayerID),
         FOREIGN KEY (ClubID) REFERENCES Clubs(ClubID)
     )
     """,
+    # One row per player per dataset version/update, partitioned by FIFA
+    # version (partitions are added by the loader as new versions appear).
+    # Partitioned tables can't carry foreign keys in MySQL.
+    f"""
+    CREATE TABLE IF NOT EXISTS PlayerRatingHistory (
+        PlayerID INT NOT NULL,
+        FifaVersion SMALLINT NOT NULL,
+        FifaUpdate SMALLINT NOT NULL,
+        ClubID INT,
+        Overall INT,
+        Value INT,
+        ValidUntil INT NOT NULL DEFAULT {HISTORY_OPEN_ENDED},
+        PRIMARY KEY (FifaVersion, PlayerID, FifaUpdate),
+        KEY ix_history_player (PlayerID, FifaVersion, FifaUpdate, Overall, Value, ClubID),
+        KEY ix_history_valid_until (ValidUntil, FifaVersion, FifaUpdate),
+        KEY ix_history_club_valid_until (ClubID, ValidUntil)
+    )
+    PARTITION BY LIST (FifaVersion) (
+        PARTITION p0 VALUES IN (0)
+    )
+    """,
+    # Club moves for the workers' leaderboards/typeahead (see ClubMoves in
+    # shared_store.py); a row without a PlayerID marks a bulk reload
+    """
+    CREATE TABLE IF NOT EXISTS PlayerClubChanges (
+        ChangeID BIGINT AUTO_INCREMENT PRIMARY KEY,
+        PlayerID INT,
+        ClubID INT,
+        ChangedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Contracts per club and calendar month of DateOfEnd, kept current by
+    # create_contract / transfer_player and rebuilt after every load
+    """
+    CREATE TABLE IF NOT EXISTS ContractExpiryBuckets (
+        ClubID INT NOT NULL,
+        ExpiryMonth DATE NOT NULL,
+        Contracts INT NOT NULL DEFAULT 0,
+        TotalReleaseClause BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (ClubID, ExpiryMonth),
+        KEY ix_expiry_month (ExpiryMonth)
+    )
+    """,
 ]
 
+# Indexes added after the tables above first shipped: (table, name, columns)
+INDEXES = [
+    ("Contracts", "ix_contracts_end", "DateOfEnd"),
+    ("Contracts", "ix_contracts_player_end", "PlayerID, DateOfEnd"),
+]
+
+REBUILD_EXPIRY_BUCKETS = [
+    "DELETE FROM ContractExpiryBuckets",
+    """
+    INSERT INTO ContractExpiryBuckets (ClubID, ExpiryMonth, Contracts, TotalReleaseClause)
+    SELECT
+        ClubID,
+        DATE_SUB(DateOfEnd, INTERVAL DAYOFMONTH(DateOfEnd) - 1 DAY),
+        COUNT(*),
+        COALESCE(SUM(ReleaseClause), 0)
+    FROM Contracts
+    WHERE ClubID IS NOT NULL AND DateOfEnd IS NOT NULL
+    GROUP BY 1, 2
+    """,
+]
+
+# Point every history row's ValidUntil at the key of the player's next row
+REBUILD_HISTORY_VALIDITY = f"""
+    UPDATE PlayerRatingHistory h
+    JOIN (
+        SELECT
+            PlayerID,
+            FifaVersion,
+            FifaUpdate,
+            LEAD(FifaVersion * {HISTORY_UPDATE_SCALE} + FifaUpdate, 1, {HISTORY_OPEN_ENDED}) OVER (
+                PARTITION BY PlayerID ORDER BY FifaVersion, FifaUpdate
+            ) AS NextKey
+        FROM PlayerRatingHistory
+    ) n ON h.PlayerID = n.PlayerID
+        AND h.FifaVersion = n.FifaVersion
+        AND h.FifaUpdate = n.FifaUpdate
+    SET h.ValidUntil = n.NextKey
+    WHERE h.ValidUntil <> n.NextKey
+"""
+
+
+def ensure_indexes(cursor):
+    for table, name, columns in INDEXES:
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND LOWER(TABLE_NAME) = LOWER(%s) AND INDEX_NAME = %s
+            """,
+            (table, name),
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+
+
+def rebuild_expiry_buckets(cursor):
+    for stmt in REBUILD_EXPIRY_BUCKETS:
+        cursor.execute(stmt)
+
+
+def rebuild_history_validity(cursor):
+    cursor.execute(REBUILD_HISTORY_VALIDITY)
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,81 @@
+import sys
 import pandas as pd
 from .db_connect import get_connection
+from .init_db import rebuild_expiry_buckets, rebuild_history_validity
 from datetime import datetime
 
+DEFAULT_CSV_PATH = "datasets/male_players.csv"
+HISTORY_BATCH_SIZE = 5000
 
-def main():
+
+def ensure_history_partitions(cursor, versions):
+    cursor.execute(
+        """
+        SELECT PARTITION_DESCRIPTION FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND LOWER(TABLE_NAME) = 'playerratinghistory'
+    """
+    )
+    existing = set()
+    for (description,) in cursor.fetchall():
+        if description:
+            existing.update(int(v) for v in str(description).split(","))
+
+    for version in sorted(set(versions) - existing):
+        cursor.execute(
+            f"ALTER TABLE PlayerRatingHistory "
+            f"ADD PARTITION (PARTITION p{version} VALUES IN ({version}))"
+        )
+
+
+def load_rating_history(cursor, df):
+    if "fifa_version" not in df.columns:
+        print("No fifa_version column in the dataset; skipping rating history")
+        return
+
+    history = df[["player_id", "fifa_version", "club_team_id", "overall", "value_eur"]].copy()
+    history["fifa_update"] = df["fifa_update"] if "fifa_update" in df.columns else 1
+    history = history.dropna(subset=["player_id", "fifa_version"])
+    ensure_history_partitions(cursor, history["fifa_version"].astype(int).unique())
+
+    def rows():
+        for row in history.itertuples(index=False):
+            yield (
+                int(row.player_id),
+                int(row.fifa_version),
+                int(row.fifa_update) if pd.notnull(row.fifa_update) else 1,
+                int(row.club_team_id) if pd.notnull(row.club_team_id) else None,
+                int(row.overall) if pd.notnull(row.overall) else None,
+                int(row.value_eur) if pd.notnull(row.value_eur) else 0,
+            )
+
+    batch = []
+    for row in rows():
+        batch.append(row)
+        if len(batch) >= HISTORY_BATCH_SIZE:
+            insert_history_batch(cursor, batch)
+            batch = []
+    if batch:
+        insert_history_batch(cursor, batch)
+    # New rows close the validity range of the row before them
+    rebuild_history_validity(cursor)
+
+
+def insert_history_batch(cursor, batch):
+    # Multi-row insert; reloading the same file just refreshes the values
+    cursor.executemany(
+        """
+        INSERT INTO PlayerRatingHistory (
+            PlayerID, FifaVersion, FifaUpdate, ClubID, Overall, Value
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            ClubID = VALUES(ClubID), Overall = VALUES(Overall), Value = VALUES(Value)
+    """,
+        batch,
+    )
+
+
+def main(csv_path=DEFAULT_CSV_PATH):
     conn = get_connection(include_db=False)
     cursor = conn.cursor()
     cursor.execute("CREATE DATABASE IF NOT EXISTS playerdb")
@@ -14,7 +86,7 @@ def main():
     conn = get_connection()
     cursor = conn.cursor()
 
-    df = pd.read_csv("datasets/male_players.csv", low_memory=False)
+    df = pd.read_csv(csv_path, low_memory=False)
 
     nationality_df = df[["nationality_id", "nationality_name"]].drop_duplicates()
     for _, row in nationality_df.iterrows():
@@ -148,10 +220,16 @@ def main():
             except Exception as e:
                 print(f"Error inserting contract for player {player_id}: {e}")
 
+    # Every row is kept in the history table, not just the first per player
+    load_rating_history(cursor, df)
+    rebuild_expiry_buckets(cursor)
+    # Workers rebuild their player store when they see this reload marker
+    cursor.execute("INSERT INTO PlayerClubChanges (PlayerID, ClubID) VALUES (NULL, NULL)")
+
     conn.commit()
     cursor.close()
     conn.close()
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH)